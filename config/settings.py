@@ -10,4 +10,14 @@ SCHEMA_PATH = os.path.join(_PROJECT_ROOT, "database", "schema.sql")
 
 # MCP Settings
 MCP_HOST = "127.0.0.1"
-MCP_PORT = 58889  # Use a different port to avoid conflicts
+# Use a different port to avoid conflicts. Can be overridden with the
+# MCP_PORT environment variable; 0 lets the OS pick a free port, which the
+# server stores in MCPServer.port once it is listening
+MCP_PORT = int(os.environ.get("MCP_PORT", 58889))
+# Number of server processes sharing the port via SO_REUSEPORT. Opt-in
+# (MCP_WORKERS environment variable) and Linux only: macOS and the BSDs accept
+# SO_REUSEPORT but hand all connections to one socket instead of balancing them
+MCP_WORKERS = int(os.environ.get("MCP_WORKERS", 1))
+# Threads per server process that run blocking database calls; each thread
+# uses its own pooled SQLite connection
+DB_WORKERS = min(8, os.cpu_count() or 1)
@@ -0,0 +1,140 @@
+import queue
+import sqlite3
+import logging
+from contextlib import contextmanager
+
+from config import settings
+from database.db_manager import DatabaseManager
+
+class DatabaseConnectionPool:
+    """
+    Fixed-size pool of DatabaseManager instances for concurrent use.
+
+    Each pooled DatabaseManager owns its own SQLite connection, so several
+    threads can run database calls at the same time without sharing a
+    connection or interleaving each other's transactions. A connection is
+    held only for the duration of a single call and then returned to the pool.
+
+    Attributes:
+        size (int): Number of pooled connections
+        db_path (str): Path to the SQLite database file
+        logger (logging.Logger): Logger instance for this class
+
+    Example:
+        pool = DatabaseConnectionPool(size=4)
+        with pool.connection() as db:
+            logs = db.get_usage_logs({"user": "john_doe"})
+        pool.close()
+    """
+
+    def __init__(self, size=settings.DB_WORKERS, db_path=settings.DB_PATH):
+        """
+        Open all pooled connections.
+
+        Args:
+            size (int): Number of connections to open. Defaults to settings.DB_WORKERS
+            db_path (str): Path to SQLite database file. Defaults to settings.DB_PATH
+
+        Raises:
+            sqlite3.Error: If a connection cannot be opened
+        """
+        self.size = size
+        self.db_path = db_path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._managers = []
+        # LIFO so the most recently used (warmest) connection is reused first
+        self._idle = queue.LifoQueue()
+
+        for _ in range(size):
+            db = DatabaseManager(db_path)
+            db.connect()
+            self._managers.append(db)
+            self._idle.put(db)
+
+        self.logger.info(f"Opened {size} pooled connections to {db_path}")
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a DatabaseManager from the pool for the duration of a with-block.
+
+        Blocks until a connection is free. If an SQLite error escapes the
+        block, any open transaction is rolled back before the connection goes
+        back to the pool. Query errors (bad SQL, constraint violations) leave
+        the connection usable; only if the rollback itself fails is the
+        connection reopened, so a broken connection is never handed out again.
+
+        Yields:
+            DatabaseManager: A connected database manager
+
+        Example:
+            with pool.connection() as db:
+                db.create_usage_log(log_data)
+        """
+        db = self._idle.get()
+        try:
+            yield db
+        except sqlite3.Error:
+            self._recover(db)
+            raise
+        finally:
+            self._idle.put(db)
+
+    def run(self, func, *args):
+        """
+        Call func with a pooled DatabaseManager as its first argument.
+
+        Args:
+            func (callable): Function taking a DatabaseManager followed by *args
+            *args: Remaining arguments for func
+
+        Returns:
+            Any: Whatever func returns
+
+        Example:
+            users = pool.run(DatabaseManager.get_unique_users)
+        """
+        with self.connection() as db:
+            return func(db, *args)
+
+    def _recover(self, db):
+        """
+        Make a pooled DatabaseManager usable again after an SQLite error.
+
+        Args:
+            db (DatabaseManager): Manager whose operation failed
+        """
+        try:
+            if db.conn is not None and db.conn.in_transaction:
+                db.conn.rollback()
+        except sqlite3.Error:
+            # The connection itself failed (closed, I/O error, ...)
+            self._reconnect(db)
+
+    def _reconnect(self, db):
+        """
+        Replace the SQLite connection of a pooled DatabaseManager.
+
+        Args:
+            db (DatabaseManager): Manager whose connection failed
+        """
+        self.logger.warning("Reopening pooled database connection after an error")
+        try:
+            db.disconnect()
+        except sqlite3.Error:
+            pass
+        try:
+            db.connect()
+        except sqlite3.Error:
+            # Leave it disconnected; DatabaseManager connects again on next use
+            db.conn = None
+
+    def close(self):
+        """
+        Close every pooled connection.
+
+        Should only be called once no more database calls are running.
+        """
+        for db in self._managers:
+            db.disconnect()
+        self.logger.info("Closed pooled database connections")
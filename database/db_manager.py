@@ -1,6 +1,7 @@
 import sqlite3
 import logging
 import os
+from contextlib import contextmanager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -31,6 +32,8 @@ class DatabaseManager:
         self.db_path = db_path
         self.conn = None
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Nesting depth of transaction() blocks; only the outermost one commits
+        self._transaction_depth = 0
 
     def __enter__(self):
         """
@@ -66,12 +69,20 @@ class DatabaseManager:
         The Row factory allows accessing columns by name instead of index,
         making the code more readable and maintainable.
         
+        The database is switched to WAL journaling so readers never wait for
+        a writer, and each connection uses synchronous=NORMAL, which is safe
+        in WAL mode and avoids an fsync on every commit.
+        
         Raises:
             sqlite3.Error: If database connection fails
         """
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # The MCP server uses the connection from its database thread
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
+            # journal_mode is stored in the database file; synchronous is per connection
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
             self.logger.info(f"Successfully connected to database at {self.db_path}")
         except sqlite3.Error as e:
             self.logger.error(f"Error connecting to database: {e}")
@@ -88,7 +99,61 @@ class DatabaseManager:
             self.conn.close()
             self.logger.info("Database connection closed.")
 
-    def initialize_database(self, schema_path=settings.SCHEMA_PATH):
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Group several operations into a single transaction.
+        
+        The block is committed when it completes and rolled back if it raises.
+        DatabaseManager methods called inside the block join the surrounding
+        transaction instead of committing on their own, so a sequence of
+        creates, updates, and deletes costs one commit and is applied
+        atomically. Blocks may be nested; only the outermost one commits.
+        
+        Note that the CRUD methods catch database errors and report them
+        through their return values, so a failed step does not by itself
+        roll back the steps before it; raise from the block to do that.
+        
+        By default SQLite only takes the write lock at the first write, so
+        rows read earlier in the block may be changed by another connection
+        before it. With immediate=True the transaction starts with
+        BEGIN IMMEDIATE, taking the write lock up front; read-modify-write
+        blocks need this to be safe against other connections and processes.
+        
+        Args:
+            immediate (bool): Take the write lock when the transaction
+                              begins. Defaults to False
+        
+        Yields:
+            DatabaseManager: Self instance
+        
+        Example:
+            with db.transaction():
+                log_id = db.create_usage_log(log_data)
+                db.update_usage_log(log_id, {'duration_seconds': 60})
+        """
+        # Ensure connection is available
+        if self.conn is None:
+            self.connect()
+
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self._transaction_depth = 1
+        try:
+            with self.conn:
+                if immediate and not self.conn.in_transaction:
+                    self.conn.execute("BEGIN IMMEDIATE")
+                yield self
+        finally:
+            self._transaction_depth = 0
+
+    def initialize_database(self, schema_path=settings.SCHEMA_PATH, schema_sql=None):
         """
         Initialize the database by executing the schema SQL file.
         
@@ -96,22 +161,34 @@ class DatabaseManager:
         indexes, and any other database structures. It's safe to run multiple
         times as the schema uses 'IF NOT EXISTS' clauses.
         
+        Callers that initialize many databases can read the schema once and
+        pass it as schema_sql, so the file is not opened and read every time.
+        
         Args:
             schema_path (str): Path to the SQL schema file. Defaults to settings.SCHEMA_PATH
+            schema_sql (str): Schema SQL to execute instead of reading schema_path.
+                              Defaults to None
             
         Raises:
             sqlite3.Error: If database initialization fails
             FileNotFoundError: If schema file doesn't exist
+        
+        Example:
+            with open(settings.SCHEMA_PATH) as f:
+                schema_sql = f.read()
+            db.initialize_database(schema_sql=schema_sql)
         """
         if self.conn is None:
             self.connect()
 
-        if not os.path.exists(schema_path):
+        if schema_sql is not None:
+            schema = schema_sql
+        elif not os.path.exists(schema_path):
             self.logger.error(f"Schema file not found at {schema_path}")
             return
-
-        with open(schema_path, 'r') as f:
-            schema = f.read()
+        else:
+            with open(schema_path, 'r') as f:
+                schema = f.read()
 
         try:
             cursor = self.conn.cursor()
@@ -155,6 +232,83 @@ class DatabaseManager:
         if self.conn is None:
             self.connect()
         
+        processed_data = self._prepare_usage_log(log_data)
+        if processed_data is None:
+            return None
+
+        try:
+            with self.transaction(immediate=True):
+                cursor = self.conn.cursor()
+                log_id, existing_duration = self._upsert_usage_log(cursor, processed_data)
+                
+                if existing_duration is not None:
+                    new_duration = existing_duration + processed_data['duration_seconds']
+                    self.logger.info(f"Updated existing usage log ID {log_id}. Duration increased from {existing_duration} to {new_duration} seconds.")
+                else:
+                    self.logger.info(f"New usage log created with ID: {log_id}")
+                return log_id
+                    
+        except sqlite3.IntegrityError as e:
+            self.logger.error(f"Integrity error creating usage log: {e}")
+            return None
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating usage log: {e}")
+            return None
+
+    def create_usage_logs(self, entries: list):
+        """
+        Create several usage log entries in a single transaction.
+        
+        Each entry is handled exactly like create_usage_log(), including
+        merging with an existing record for the same date, user, and
+        application_name, but the whole batch is committed at once. Entries
+        with missing fields are skipped and reported as None; if a database
+        error occurs, the whole batch is rolled back.
+        
+        Args:
+            entries (list): Dictionaries with the fields required by create_usage_log()
+            
+        Returns:
+            list: ID of the created or updated log for each entry (None for
+                  skipped entries), or None if the transaction failed
+        
+        Example:
+            ids = db.create_usage_logs([log_data_1, log_data_2])
+        """
+        # Ensure connection is available
+        if self.conn is None:
+            self.connect()
+
+        prepared = [self._prepare_usage_log(entry) for entry in entries]
+
+        try:
+            with self.transaction(immediate=True):
+                cursor = self.conn.cursor()
+                log_ids = [
+                    self._upsert_usage_log(cursor, data)[0] if data is not None else None
+                    for data in prepared
+                ]
+            self.logger.info(f"Created or updated {len(log_ids)} usage logs in one transaction.")
+            return log_ids
+        
+        except sqlite3.IntegrityError as e:
+            self.logger.error(f"Integrity error creating usage logs: {e}")
+            return None
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating usage logs: {e}")
+            return None
+
+    def _prepare_usage_log(self, log_data: dict):
+        """
+        Validate a usage log entry and convert it for storage.
+        
+        Args:
+            log_data (dict): Usage log fields as received from the caller
+            
+        Returns:
+            dict: Copy of log_data with legacy_app stored as 1/0, or None if
+                  required fields are missing
+        """
         # Validate required fields for new schema
         required_fields = ['monitor_app_version', 'platform', 'user', 'application_name', 
                           'application_version', 'log_date', 'legacy_app', 'duration_seconds']
@@ -169,66 +323,67 @@ class DatabaseManager:
         if 'legacy_app' in processed_data:
             # Convert to 1/0 for SQLite boolean storage
             processed_data['legacy_app'] = 1 if processed_data['legacy_app'] else 0
+        return processed_data
 
-        try:
-            with self.conn:
-                cursor = self.conn.cursor()
-                
-                # Check if a record with same date, user, and application_name exists
-                check_sql = """
-                    SELECT id, duration_seconds FROM usage_data 
-                    WHERE log_date = ? AND user = ? AND application_name = ?
-                """
-                cursor.execute(check_sql, (
-                    processed_data['log_date'], 
-                    processed_data['user'], 
-                    processed_data['application_name']
-                ))
-                existing_record = cursor.fetchone()
-                
-                if existing_record:
-                    # Update existing record by adding duration
-                    existing_id = existing_record['id']
-                    existing_duration = existing_record['duration_seconds']
-                    new_duration = existing_duration + processed_data['duration_seconds']
-                    
-                    # Also update other fields from the new data
-                    update_sql = """
-                        UPDATE usage_data 
-                        SET duration_seconds = ?, 
-                            monitor_app_version = ?,
-                            platform = ?,
-                            application_version = ?,
-                            legacy_app = ?
-                        WHERE id = ?
-                    """
-                    cursor.execute(update_sql, (
-                        new_duration,
-                        processed_data['monitor_app_version'],
-                        processed_data['platform'],
-                        processed_data['application_version'],
-                        processed_data['legacy_app'],
-                        existing_id
-                    ))
-                    
-                    self.logger.info(f"Updated existing usage log ID {existing_id}. Duration increased from {existing_duration} to {new_duration} seconds.")
-                    return existing_id
-                else:
-                    # Insert new record
-                    columns = ', '.join(processed_data.keys())
-                    placeholders = ', '.join('?' for _ in processed_data)
-                    sql = f"INSERT INTO usage_data ({columns}) VALUES ({placeholders})"
-                    cursor.execute(sql, list(processed_data.values()))
-                    
-                    self.logger.info(f"New usage log created with ID: {cursor.lastrowid}")
-                    return cursor.lastrowid
-                    
-        except sqlite3.IntegrityError as e:
-            self.logger.error(f"Integrity error creating usage log: {e}")
-            return None
-        except sqlite3.Error as e:
-            self.logger.error(f"Database error creating usage log: {e}")
-            return None
+    def _upsert_usage_log(self, cursor, processed_data: dict):
+        """
+        Insert a prepared usage log, or add it to the matching existing record.
+        
+        Must be called inside a transaction(immediate=True), so no other
+        connection can change the record between the lookup and the write.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the open transaction
+            processed_data (dict): Entry returned by _prepare_usage_log()
+            
+        Returns:
+            tuple: (log ID, previous duration of the merged record, or None
+                   if a new record was inserted)
+        """
+        # Check if a record with same date, user, and application_name exists
+        check_sql = """
+            SELECT id, duration_seconds FROM usage_data 
+            WHERE log_date = ? AND user = ? AND application_name = ?
+        """
+        cursor.execute(check_sql, (
+            processed_data['log_date'], 
+            processed_data['user'], 
+            processed_data['application_name']
+        ))
+        existing_record = cursor.fetchone()
+        
+        if existing_record:
+            # Update existing record by adding duration
+            existing_id = existing_record['id']
+            existing_duration = existing_record['duration_seconds']
+            new_duration = existing_duration + processed_data['duration_seconds']
+            
+            # Also update other fields from the new data
+            update_sql = """
+                UPDATE usage_data 
+                SET duration_seconds = ?, 
+                    monitor_app_version = ?,
+                    platform = ?,
+                    application_version = ?,
+                    legacy_app = ?
+                WHERE id = ?
+            """
+            cursor.execute(update_sql, (
+                new_duration,
+                processed_data['monitor_app_version'],
+                processed_data['platform'],
+                processed_data['application_version'],
+                processed_data['legacy_app'],
+                existing_id
+            ))
+            return existing_id, existing_duration
+        
+        # Insert new record
+        columns = ', '.join(processed_data.keys())
+        placeholders = ', '.join('?' for _ in processed_data)
+        sql = f"INSERT INTO usage_data ({columns}) VALUES ({placeholders})"
+        cursor.execute(sql, list(processed_data.values()))
+        return cursor.lastrowid, None
 
     def get_usage_logs(self, filters: dict = None):
         """
@@ -261,6 +416,36 @@ class DatabaseManager:
                 'user': 'john_doe'
             })
         """
+        try:
+            result = list(self.iter_usage_logs(filters))
+            self.logger.info(f"Retrieved {len(result)} usage logs.")
+            return result
+        except sqlite3.Error as e:
+            self.logger.error(f"Error retrieving usage logs: {e}")
+            return []
+
+    def iter_usage_logs(self, filters: dict = None):
+        """
+        Yield usage logs one at a time as they are read from the database.
+        
+        Rows are stepped from the SQLite cursor and converted individually,
+        so a large result set is never held in memory as a whole. Takes the
+        same filters as get_usage_logs().
+        
+        Args:
+            filters (dict, optional): Dictionary of column-value pairs for filtering.
+                                    Keys should match database column names.
+        
+        Yields:
+            dict: One usage log record, with legacy_app as True/False
+        
+        Raises:
+            sqlite3.Error: If the query fails, possibly after some rows were yielded
+        
+        Example:
+            for log in db.iter_usage_logs({'platform': 'Windows'}):
+                print(log['user'])
+        """
         # Ensure connection is available
         if self.conn is None:
             self.connect()
@@ -274,25 +459,43 @@ class DatabaseManager:
                 params.append(value)
             sql += " WHERE " + " AND ".join(conditions)
 
+        # A plain read, not a transaction(): the generator may be suspended or
+        # abandoned between rows, and must not leave the nesting depth raised
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        for row in cursor:
+            row_dict = dict(row)
+            # Convert legacy_app from 1/0 to True/False
+            if 'legacy_app' in row_dict:
+                row_dict['legacy_app'] = bool(row_dict['legacy_app'])
+            yield row_dict
+
+    def count_usage_logs(self):
+        """
+        Count the usage log records in the database.
+        
+        The count is computed by SQLite, so no rows are transferred or
+        converted to dictionaries.
+        
+        Returns:
+            int: Number of usage log records. Returns 0 on error.
+        
+        Example:
+            total = db.count_usage_logs()
+            # Result: 50000
+        """
+        # Ensure connection is available
+        if self.conn is None:
+            self.connect()
+            
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
-                cursor.execute(sql, params)
-                rows = cursor.fetchall()
-                self.logger.info(f"Retrieved {len(rows)} usage logs.")
-                
-                # Convert rows to dict and handle boolean conversion
-                result = []
-                for row in rows:
-                    row_dict = dict(row)
-                    # Convert legacy_app from 1/0 to True/False
-                    if 'legacy_app' in row_dict:
-                        row_dict['legacy_app'] = bool(row_dict['legacy_app'])
-                    result.append(row_dict)
-                return result
+                cursor.execute("SELECT COUNT(*) FROM usage_data")
+                return cursor.fetchone()[0]
         except sqlite3.Error as e:
-            self.logger.error(f"Error retrieving usage logs: {e}")
-            return []
+            self.logger.error(f"Error counting usage logs: {e}")
+            return 0
 
     def update_usage_log(self, log_id: int, updates: dict):
         """
@@ -346,10 +549,9 @@ class DatabaseManager:
         params = list(updates.values()) + [log_id]
 
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 cursor.execute(sql, params)
-                self.conn.commit()
                 
                 # Check if any rows were actually updated
                 if cursor.rowcount == 0:
@@ -399,10 +601,9 @@ class DatabaseManager:
             
         sql = "DELETE FROM usage_data WHERE id = ?"
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 cursor.execute(sql, (log_id,))
-                self.conn.commit()
                 
                 # Check if any rows were actually deleted
                 if cursor.rowcount == 0:
@@ -435,7 +636,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 cursor.execute("SELECT DISTINCT user FROM usage_data ORDER BY user")
                 users = [row[0] for row in cursor.fetchall()]
@@ -465,7 +666,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 cursor.execute("SELECT DISTINCT application_name FROM usage_data ORDER BY application_name")
                 applications = [row[0] for row in cursor.fetchall()]
@@ -495,7 +696,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 cursor.execute("SELECT DISTINCT platform FROM usage_data ORDER BY platform")
                 platforms = [row[0] for row in cursor.fetchall()]
@@ -525,7 +726,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 sql = """
                     SELECT 
@@ -563,7 +764,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 
                 if app_name:
@@ -618,7 +819,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 
                 if app_name:
@@ -673,7 +874,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 sql = """
                     WITH user_first_dates AS (
@@ -712,7 +913,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 
                 if app_name:
@@ -766,7 +967,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 sql = """
                     SELECT 
@@ -805,7 +1006,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 
                 if app_name:
@@ -860,7 +1061,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 
                 # Overall user stats
@@ -920,7 +1121,7 @@ class DatabaseManager:
             self.connect()
             
         try:
-            with self.conn:
+            with self.transaction():
                 cursor = self.conn.cursor()
                 
                 # Overall system stats
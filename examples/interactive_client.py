@@ -346,19 +346,20 @@ class InteractiveMCPClient:
         print("\n📊 DATA SUMMARY")
         print("-" * 40)
         
-        # Get all logs
-        all_logs = await self.client.get_usage_logs()
+        # Get all logs and unique values; the requests are independent, so
+        # they share the connection concurrently instead of one at a time
+        all_logs, users, apps, platforms = await asyncio.gather(
+            self.client.get_usage_logs(),
+            self.client.get_unique_users(),
+            self.client.get_unique_applications(),
+            self.client.get_unique_platforms()
+        )
         if not all_logs:
             print("❌ No data found")
             return
         
         print(f"📊 Total Logs: {len(all_logs)}")
         
-        # Get unique values
-        users = await self.client.get_unique_users()
-        apps = await self.client.get_unique_applications()
-        platforms = await self.client.get_unique_platforms()
-        
         print(f"👥 Unique Users: {len(users) if users else 0}")
         print(f"📱 Unique Applications: {len(apps) if apps else 0}")
         print(f"💻 Unique Platforms: {len(platforms) if platforms else 0}")
@@ -401,8 +402,10 @@ class InteractiveMCPClient:
         
         # Test 1: Create logs
         print("1. Testing create_usage_log...")
-        for i, data in enumerate(test_data):
-            log_id = await self.client.create_usage_log(data)
+        # The entries are independent, so create them concurrently
+        log_ids = await asyncio.gather(
+            *(self.client.create_usage_log(data) for data in test_data))
+        for i, log_id in enumerate(log_ids):
             if log_id:
                 created_ids.append(log_id)
                 print(f"  ✅ Created log {i+1} with ID: {log_id}")
@@ -420,13 +423,13 @@ class InteractiveMCPClient:
         # Test 3: Get unique values
         print("3. Testing unique value methods...")
         
-        users = await self.client.get_unique_users()
+        users, apps, platforms = await asyncio.gather(
+            self.client.get_unique_users(),
+            self.client.get_unique_applications(),
+            self.client.get_unique_platforms()
+        )
         print(f"  👥 Users: {len(users) if users else 0}")
-        
-        apps = await self.client.get_unique_applications()
         print(f"  📱 Apps: {len(apps) if apps else 0}")
-        
-        platforms = await self.client.get_unique_platforms()
         print(f"  💻 Platforms: {len(platforms) if platforms else 0}")
         
         # Test 4: Update a log
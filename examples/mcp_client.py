@@ -1,7 +1,8 @@
 import asyncio
-import json
 import logging
-import uuid
+import functools
+import itertools
+import orjson
 from typing import Dict, Any, Optional, List
 import sys
 import os
@@ -14,20 +15,85 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 from config import settings
+from mcp.framing import send_frame, recv_frame, set_low_latency
 
 # MCP Protocol Constants
-MCP_PROTOCOL_VERSION = "2024-11-05"
+# 2025-06-18 lets the server send tool results as structuredContent, which is
+# decoded together with the response instead of as a second JSON text
+MCP_PROTOCOL_VERSION = "2025-06-18"
+
+
+def _load_result(text: str) -> Any:
+    """Decode a tool's text payload and return only its "result" member."""
+    return orjson.loads(text).get("result")
+
+
+def _tool_result(result: Dict[str, Any]) -> Any:
+    """
+    Return the "result" member of a tools/call result.
+    
+    The server sends the payload as structuredContent, which was already
+    decoded together with the response. The JSON text content is only
+    decoded for servers that do not send structured content.
+    """
+    structured = result.get("structuredContent")
+    if structured is not None:
+        return structured.get("result")
+    return _load_result(result["content"][0]["text"])
+
+
+def _request_template(method: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Pre-serialize a request whose method and params never change.
+    
+    Returns a bytes %-template in which only the id is filled in per call:
+    ``template % request_id``.
+    """
+    template = b'{"jsonrpc":"2.0","method":' + orjson.dumps(method)
+    if params is not None:
+        template += b',"params":' + orjson.dumps(params).replace(b"%", b"%%")
+    return template + b',"id":%d}'
+
+
+@functools.lru_cache(maxsize=64)
+def _tool_call_prefix(tool_name: str) -> bytes:
+    """Pre-serialize the start of a tools/call request, up to its arguments."""
+    return (b'{"jsonrpc":"2.0","method":"tools/call","params":{"name":'
+            + orjson.dumps(tool_name) + b',"arguments":')
+
+
+# Requests that are identical apart from their id
+_INITIALIZE_REQUEST = _request_template("initialize", {
+    "protocolVersion": MCP_PROTOCOL_VERSION,
+    "capabilities": {
+        "tools": {},
+        "resources": {}
+    },
+    "clientInfo": {
+        "name": "application-usage-client",
+        "version": "1.0.0"
+    }
+})
+_TOOLS_LIST_REQUEST = _request_template("tools/list")
+_RESOURCES_LIST_REQUEST = _request_template("resources/list")
+_PING_REQUEST = _request_template("ping")
+
+# Pieces of requests with a variable part, joined around that part per call
+_RESOURCES_READ_PREFIX = b'{"jsonrpc":"2.0","method":"resources/read","params":{"uri":'
+_PARAMS_END_TEMPLATE = b'},"id":%d}'
+
 
 class MCPClient:
     """
     Model Context Protocol (MCP) Client Implementation.
     
     This class provides a comprehensive client interface for communicating with MCP servers
-    following the MCP 2024-11-05 specification. It handles connection management, protocol
+    following the MCP 2025-06-18 specification. It handles connection management, protocol
     handshaking, tool calling, and resource access through JSON-RPC 2.0 messaging.
     
     The client supports:
     - Async TCP connection management
+    - Request pipelining: many requests can be in flight on one connection
     - MCP protocol initialization and handshaking
     - Tool discovery and execution
     - Resource discovery and reading
@@ -66,6 +132,11 @@ class MCPClient:
         self.server_capabilities = {}
         self.available_tools = []
         self.available_resources = []
+        # Futures of in-flight requests, keyed by JSON-RPC id
+        self._pending = {}
+        # JSON-RPC ids only need to be unique within this client session
+        self._id_counter = itertools.count(1)
+        self._reader_task = None
 
     async def connect(self) -> bool:
         """
@@ -87,6 +158,9 @@ class MCPClient:
         """
         try:
             self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            sock = self.writer.get_extra_info('socket')
+            set_low_latency(sock)
+            self._reader_task = asyncio.create_task(self._reader_loop())
             logger.info(f"Connected to MCP server at {self.host}:{self.port}")
             return True
         except ConnectionRefusedError:
@@ -106,16 +180,76 @@ class MCPClient:
         Example:
             await client.disconnect()
         """
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+            self._fail_pending(ConnectionError("Disconnected from server"))
+
         if self.writer:
             self.writer.close()
             await self.writer.wait_closed()
             logger.info("Disconnected from MCP server")
 
+    def _fail_pending(self, exc: Exception):
+        """
+        Fail every in-flight request with the given exception.
+        
+        Args:
+            exc (Exception): Error to raise in the waiting callers
+        """
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _reader_loop(self):
+        """
+        Read responses from the server and resolve the matching requests.
+        
+        Runs as a background task for the lifetime of the connection, so
+        several requests can be in flight at the same time. Each response is
+        routed to the pending request with the same JSON-RPC id.
+        """
+        try:
+            while True:
+                data = await recv_frame(self.reader)
+                try:
+                    response = orjson.loads(data)
+                except ValueError as e:
+                    # The response cannot be attributed to a request
+                    logger.error(f"Failed to decode server response: {e}")
+                    self._fail_pending(e)
+                    continue
+
+                response_id = response.get("id")
+                if response_id is None and "error" in response:
+                    # The server could not attribute the error to a request
+                    for future in self._pending.values():
+                        if not future.done():
+                            future.set_result(response)
+                    self._pending.clear()
+                    continue
+
+                future = self._pending.pop(response_id, None)
+                if future is None:
+                    logger.warning(f"Received response for unknown request id: {response_id}")
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.IncompleteReadError:
+            self._fail_pending(ConnectionError("Connection closed by server"))
+        except Exception as e:
+            logger.error(f"Error reading from server: {e}")
+            self._fail_pending(e)
+
     async def initialize(self) -> bool:
         """
         Initialize MCP session with protocol handshake.
         
-        Performs the MCP initialization sequence according to the MCP 2024-11-05
+        Performs the MCP initialization sequence according to the MCP 2025-06-18
         specification. This includes:
         1. Establishing TCP connection (if not already connected)
         2. Sending initialize request with client capabilities
@@ -136,24 +270,8 @@ class MCPClient:
             if not await self.connect():
                 return False
 
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "initialize",
-            "params": {
-                "protocolVersion": MCP_PROTOCOL_VERSION,
-                "capabilities": {
-                    "tools": {},
-                    "resources": {}
-                },
-                "clientInfo": {
-                    "name": "application-usage-client",
-                    "version": "1.0.0"
-                }
-            }
-        }
-
-        response = await self.send_request(init_request)
+        request_id = next(self._id_counter)
+        response = await self._send_payload(request_id, _INITIALIZE_REQUEST % request_id)
         if response and "result" in response:
             self.server_capabilities = response["result"].get("capabilities", {})
             self.initialized = True
@@ -173,10 +291,13 @@ class MCPClient:
         
         Handles the low-level communication with the MCP server, including:
         - JSON serialization of requests
-        - TCP transmission
-        - Response reading and JSON deserialization
+        - Length-prefixed TCP framing
+        - Waiting for the response with the same id
         - Error handling for network and parsing issues
         
+        Requests are pipelined: concurrent calls share the connection and do
+        not wait for each other's round trips.
+        
         Args:
             request (Dict[str, Any]): JSON-RPC request dictionary containing
                                      method, params, id, and jsonrpc fields
@@ -185,59 +306,61 @@ class MCPClient:
             Optional[Dict[str, Any]]: Parsed JSON response from server, or None on error
             
         Raises:
-            json.JSONDecodeError: If server response is not valid JSON
+            ValueError: If server response is not valid JSON
             Exception: For network or other communication errors
             
         Example:
             request = {
                 "jsonrpc": "2.0",
-                "id": "123",
+                "id": 123,
                 "method": "tools/list"
             }
             response = await client.send_request(request)
         """
-        if not self.writer:
+        return await self._send_payload(request["id"], orjson.dumps(request))
+
+    async def _send_payload(self, request_id: int, payload: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Send an already encoded JSON-RPC request and wait for its response.
+        
+        Args:
+            request_id (int): The id embedded in the payload
+            payload (bytes): Encoded JSON-RPC request
+        
+        Returns:
+            Optional[Dict[str, Any]]: Parsed JSON response from server, or None on error
+        """
+        if not self.writer or self._reader_task is None or self._reader_task.done():
             logger.error("Not connected to server")
             return None
 
-        try:
-            message = json.dumps(request)
-            logger.debug(f"Sending: {message}")
-
-            self.writer.write(message.encode())
-            await self.writer.drain()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
 
-            # Read the response properly, handling large responses
-            response_data = b""
-            while True:
-                chunk = await self.reader.read(4096)
-                if not chunk:
-                    break
-                response_data += chunk
-                
-                # Try to parse the JSON to see if we have a complete message
-                try:
-                    response = json.loads(response_data.decode())
-                    logger.debug(f"Received: {response}")
-                    return response
-                except json.JSONDecodeError:
-                    # Not a complete JSON yet, continue reading
-                    continue
+        debug = logger.isEnabledFor(logging.DEBUG)
+        try:
+            if debug:
+                logger.debug("Sending: %s", payload)
 
-            if not response_data:
-                logger.error("No response from server")
-                return None
+            await send_frame(self.writer, payload)
 
-            response = json.loads(response_data.decode())
-            logger.debug(f"Received: {response}")
+            # Resolved by _reader_loop once the matching response arrives
+            response = await future
+            if debug:
+                logger.debug("Received: %s", response)
             return response
 
-        except json.JSONDecodeError as e:
+        except ConnectionError as e:
+            logger.error(f"No response from server: {e}")
+            return None
+        except ValueError as e:
             logger.error(f"Failed to decode server response: {e}")
             return None
         except Exception as e:
             logger.error(f"Error sending request: {e}")
             return None
+        finally:
+            self._pending.pop(request_id, None)
 
     async def load_tools(self) -> List[Dict[str, Any]]:
         """
@@ -255,13 +378,8 @@ class MCPClient:
             for tool in tools:
                 print(f"Tool: {tool['name']} - {tool['description']}")
         """
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/list"
-        }
-
-        response = await self.send_request(request)
+        request_id = next(self._id_counter)
+        response = await self._send_payload(request_id, _TOOLS_LIST_REQUEST % request_id)
         if response and "result" in response:
             self.available_tools = response["result"].get("tools", [])
             logger.info(f"Loaded {len(self.available_tools)} tools")
@@ -284,13 +402,8 @@ class MCPClient:
             for resource in resources:
                 print(f"Resource: {resource['name']} at {resource['uri']}")
         """
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "resources/list"
-        }
-
-        response = await self.send_request(request)
+        request_id = next(self._id_counter)
+        response = await self._send_payload(request_id, _RESOURCES_LIST_REQUEST % request_id)
         if response and "result" in response:
             self.available_resources = response["result"].get("resources", [])
             logger.info(f"Loaded {len(self.available_resources)} resources")
@@ -325,17 +438,10 @@ class MCPClient:
             logger.error("Client not initialized")
             return None
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-
-        response = await self.send_request(request)
+        request_id = next(self._id_counter)
+        payload = (_tool_call_prefix(tool_name) + orjson.dumps(arguments)
+                   + _PARAMS_END_TEMPLATE % request_id)
+        response = await self._send_payload(request_id, payload)
         if response and "result" in response:
             return response["result"]
         elif response and "error" in response:
@@ -368,16 +474,9 @@ class MCPClient:
             logger.error("Client not initialized")
             return None
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "resources/read",
-            "params": {
-                "uri": uri
-            }
-        }
-
-        response = await self.send_request(request)
+        request_id = next(self._id_counter)
+        payload = _RESOURCES_READ_PREFIX + orjson.dumps(uri) + _PARAMS_END_TEMPLATE % request_id
+        response = await self._send_payload(request_id, payload)
         if response and "result" in response:
             return response["result"]
         elif response and "error" in response:
@@ -401,13 +500,8 @@ class MCPClient:
             else:
                 print("Server not responding")
         """
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "ping"
-        }
-
-        response = await self.send_request(request)
+        request_id = next(self._id_counter)
+        response = await self._send_payload(request_id, _PING_REQUEST % request_id)
         return response is not None and "result" in response
 
     # Convenience methods for database operations
@@ -446,8 +540,32 @@ class MCPClient:
         """
         result = await self.call_tool("create_usage_log", log_data)
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
+        return None
+
+    async def create_usage_logs(self, entries: List[Dict[str, Any]]) -> Optional[List[Optional[int]]]:
+        """
+        Create several usage log entries with a single tool call.
+        
+        All entries are sent in one create_usage_logs_bulk request and
+        committed by the server in one transaction, so N entries cost one
+        round trip instead of N.
+        
+        Args:
+            entries (List[Dict[str, Any]]): Usage log entries, each with the
+                                            fields required by create_usage_log
+        
+        Returns:
+            Optional[List[Optional[int]]]: ID of each created or updated log
+                                          (None for invalid entries), or None
+                                          on failure
+        
+        Example:
+            log_ids = await client.create_usage_logs([log_data_1, log_data_2])
+        """
+        result = await self.call_tool("create_usage_logs_bulk", {"entries": entries})
+        if result and "content" in result:
+            return _tool_result(result)
         return None
 
     async def get_usage_logs(self, filters: Dict[str, Any] = None) -> Optional[List[Dict[str, Any]]]:
@@ -482,8 +600,7 @@ class MCPClient:
         arguments = {"filters": filters} if filters else {}
         result = await self.call_tool("get_usage_logs", arguments)
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def update_usage_log(self, log_id: int, updates: Dict[str, Any]) -> Optional[bool]:
@@ -509,8 +626,7 @@ class MCPClient:
         """
         result = await self.call_tool("update_usage_log", {"log_id": log_id, "updates": updates})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def delete_usage_log(self, log_id: int) -> Optional[bool]:
@@ -537,8 +653,7 @@ class MCPClient:
         """
         result = await self.call_tool("delete_usage_log", {"log_id": log_id})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_usage_stats(self) -> Optional[Dict[str, Any]]:
@@ -561,7 +676,7 @@ class MCPClient:
         result = await self.read_resource("usage://stats")
         if result and "contents" in result:
             stats_text = result["contents"][0]["text"]
-            return json.loads(stats_text)
+            return orjson.loads(stats_text)
         return None
 
     async def get_unique_users(self) -> Optional[List[str]]:
@@ -582,8 +697,7 @@ class MCPClient:
         """
         result = await self.call_tool("get_unique_users", {})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_unique_applications(self) -> Optional[List[str]]:
@@ -605,8 +719,7 @@ class MCPClient:
         """
         result = await self.call_tool("get_unique_applications", {})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_unique_platforms(self) -> Optional[List[str]]:
@@ -627,8 +740,7 @@ class MCPClient:
         """
         result = await self.call_tool("get_unique_platforms", {})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     # =============================================================================
@@ -658,8 +770,7 @@ class MCPClient:
             "limit": limit
         })
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_new_users_analysis(self, start_date: str, end_date: str, app_name: str = None):
@@ -686,8 +797,7 @@ class MCPClient:
             
         result = await self.call_tool("analyze_new_users", args)
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_inactive_users_analysis(self, cutoff_date: str, app_name: str = None):
@@ -713,8 +823,7 @@ class MCPClient:
             
         result = await self.call_tool("analyze_inactive_users", args)
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_weekly_additions_analysis(self, start_date: str, end_date: str):
@@ -740,8 +849,7 @@ class MCPClient:
             "end_date": end_date
         })
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_application_stats_analysis(self, app_name: str = None):
@@ -768,8 +876,7 @@ class MCPClient:
             
         result = await self.call_tool("analyze_application_stats", args)
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_platform_distribution_analysis(self):
@@ -788,8 +895,7 @@ class MCPClient:
         """
         result = await self.call_tool("analyze_platform_distribution", {})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_daily_trends_analysis(self, start_date: str, end_date: str, app_name: str = None):
@@ -817,8 +923,7 @@ class MCPClient:
             
         result = await self.call_tool("analyze_daily_trends", args)
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_user_activity_analysis(self, user_name: str):
@@ -842,8 +947,7 @@ class MCPClient:
             "user_name": user_name
         })
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
     async def get_system_overview_analysis(self):
@@ -863,11 +967,103 @@ class MCPClient:
         """
         result = await self.call_tool("analyze_system_overview", {})
         if result and "content" in result:
-            content = json.loads(result["content"][0]["text"])
-            return content.get("result")
+            return _tool_result(result)
         return None
 
 
+class UsageLogBatcher:
+    """
+    Coalesce individual usage log creations into bulk tool calls.
+    
+    Entries passed to add() are collected until max_batch entries are waiting
+    or max_delay seconds have passed since the first of them, whichever comes
+    first, and are then created with a single create_usage_logs call. This
+    suits producers that create logs one at a time and do not know batch
+    boundaries in advance.
+    
+    Attributes:
+        client (MCPClient): Initialized client used to send the batches
+        max_batch (int): Number of waiting entries that triggers a flush
+        max_delay (float): Longest time in seconds an entry waits for a flush
+    
+    Example:
+        batcher = UsageLogBatcher(client, max_batch=100, max_delay=0.01)
+        log_ids = await asyncio.gather(*(batcher.add(entry) for entry in entries))
+    """
+    
+    def __init__(self, client: MCPClient, max_batch: int = 100, max_delay: float = 0.01):
+        """
+        Initialize an empty batcher.
+        
+        Args:
+            client (MCPClient): Initialized client used to send the batches
+            max_batch (int): Number of waiting entries that triggers a flush. Defaults to 100
+            max_delay (float): Longest wait in seconds before a flush. Defaults to 0.01
+        """
+        self.client = client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._entries = []
+        self._futures = []
+        self._timer = None
+        # Keeps timer-triggered flushes referenced until they finish
+        self._flush_tasks = set()
+
+    async def add(self, log_data: Dict[str, Any]) -> Optional[int]:
+        """
+        Queue one usage log entry and wait until its batch has been created.
+        
+        Args:
+            log_data (Dict[str, Any]): Usage log fields, as for create_usage_log
+        
+        Returns:
+            Optional[int]: ID of the created or updated log, or None on failure
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._entries.append(log_data)
+        self._futures.append(future)
+
+        if len(self._entries) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_later)
+        return await future
+
+    async def flush(self):
+        """
+        Send every waiting entry now.
+        
+        Safe to call when nothing is waiting.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        entries, futures = self._entries, self._futures
+        self._entries, self._futures = [], []
+        if not entries:
+            return
+
+        try:
+            log_ids = await self.client.create_usage_logs(entries)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, future in enumerate(futures):
+            if not future.done():
+                future.set_result(log_ids[index] if log_ids else None)
+
+    def _flush_later(self):
+        """Timer callback: flush the waiting entries in a background task."""
+        self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+
 # Example usage
 async def main():
     """
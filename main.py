@@ -1,12 +1,11 @@
 import sys
 import os
-import asyncio
 import logging
 
 # Add project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from mcp.mcp_server import MCPServer
+from mcp.mcp_server import MCPServer, run_event_loop
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -22,7 +21,7 @@ def main():
 
     try:
         logger.info("Launching MCP Server...")
-        asyncio.run(server.start())
+        run_event_loop(server.start())
     except KeyboardInterrupt:
         logger.info("Application shutting down gracefully.")
     except Exception as e:
@@ -0,0 +1,156 @@
+"""
+Message framing for the MCP TCP transport.
+
+Every JSON-RPC message is sent as a frame made of a 5-byte header followed by
+the frame body. The header holds a 1-byte flags field and the 4-byte
+big-endian length of the body. This lets the receiver read exactly one
+message at a time, regardless of how TCP segments the stream.
+
+The body is the UTF-8 encoded JSON payload. Large payloads are compressed
+with zstd, which is signalled by FLAG_ZSTD in the header.
+"""
+import asyncio
+import socket
+import struct
+
+import zstandard
+
+# Flags byte and big-endian body length that precede every body
+HEADER = struct.Struct(">BI")
+HEADER_SIZE = HEADER.size
+
+# Header flag: the body is a zstd frame containing the JSON payload
+FLAG_ZSTD = 0x01
+
+# Payloads larger than this are compressed. JSON rows with repeated keys
+# shrink several times over, which outweighs the compression cost even on
+# a loopback connection; smaller payloads are not worth it.
+COMPRESS_MIN_SIZE = 16384
+
+# Largest payload accepted from a peer, before or after decompression. A
+# corrupt or hostile header must not make the receiver buffer or allocate
+# unbounded amounts of memory.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+_compressor = zstandard.ZstdCompressor(level=1)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+class FrameError(ValueError):
+    """Raised when a received frame is too large or its body is malformed."""
+
+
+async def send_frame(writer: asyncio.StreamWriter, payload: bytes):
+    """
+    Write one length-prefixed frame and wait for the transport to drain.
+
+    Payloads larger than COMPRESS_MIN_SIZE are compressed first. The header
+    and body are queued as separate buffers so the body is never copied just
+    to prepend the header.
+
+    Args:
+        writer (asyncio.StreamWriter): Stream to write the frame to
+        payload (bytes): Encoded JSON-RPC message
+    """
+    writer.writelines(encode_frame(payload))
+    await writer.drain()
+
+
+def encode_frame(payload: bytes) -> tuple:
+    """
+    Build the header and body of one frame, compressing large payloads.
+
+    Args:
+        payload (bytes): Encoded JSON-RPC message
+
+    Returns:
+        tuple: (header, body) byte buffers to be written in order
+    """
+    flags = 0
+    if len(payload) > COMPRESS_MIN_SIZE:
+        payload = _compressor.compress(payload)
+        flags = FLAG_ZSTD
+    return HEADER.pack(flags, len(payload)), payload
+
+
+async def recv_frame(reader: asyncio.StreamReader) -> bytes:
+    """
+    Read one length-prefixed frame and return its payload.
+
+    Args:
+        reader (asyncio.StreamReader): Stream to read the frame from
+
+    Returns:
+        bytes: Encoded JSON-RPC message
+
+    Raises:
+        asyncio.IncompleteReadError: If the peer closes the connection
+                                     before a full frame was received
+        FrameError: If the frame exceeds MAX_FRAME_SIZE or cannot be decoded
+    """
+    flags, size = HEADER.unpack(await reader.readexactly(HEADER_SIZE))
+    check_frame_size(size)
+    return decode_body(flags, await reader.readexactly(size))
+
+
+def check_frame_size(size: int):
+    """
+    Reject a frame whose header announces more than MAX_FRAME_SIZE bytes.
+
+    Args:
+        size (int): Body length from the frame header
+
+    Raises:
+        FrameError: If size exceeds MAX_FRAME_SIZE
+    """
+    if size > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {size} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+
+
+def decode_body(flags: int, body) -> bytes:
+    """
+    Return the JSON payload carried by a frame body.
+
+    Args:
+        flags (int): Flags from the frame header
+        body (bytes-like): Frame body; may be a memoryview into a receive buffer
+
+    Returns:
+        bytes: Encoded JSON-RPC message, never sharing memory with body
+
+    Raises:
+        FrameError: If a compressed body is malformed or too large
+    """
+    if flags & FLAG_ZSTD:
+        try:
+            # Frames written by send_frame() always record their content size
+            size = zstandard.frame_content_size(body)
+            check_frame_size(size)
+            if size < 0:
+                raise FrameError("Compressed frame does not record its content size")
+            return _decompressor.decompress(body)
+        except zstandard.ZstdError as e:
+            raise FrameError(f"Invalid compressed frame: {e}") from e
+    return bytes(body)
+
+
+def set_low_latency(sock):
+    """
+    Disable Nagle's algorithm and, where supported, delayed ACKs on a socket.
+
+    Requests and responses are small and strictly answered, so neither side
+    should hold back a segment waiting for more data or for an ACK. asyncio
+    already disables Nagle for TCP transports; it is set explicitly so this
+    does not depend on the event loop implementation.
+
+    Args:
+        sock (socket.socket): Connected TCP socket, or None
+    """
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if hasattr(socket, "TCP_QUICKACK"):  # Linux only
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except OSError:
+        pass
@@ -1,8 +1,13 @@
 import sys
 import os
 import asyncio
-import json
+import concurrent.futures
 import logging
+import multiprocessing
+import orjson
+import signal
+import socket
+import time
 import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -11,7 +16,16 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from database.db_manager import DatabaseManager
+from database.connection_pool import DatabaseConnectionPool
 from config import settings
+from schemas.validator import compile_validator
+from mcp.framing import (HEADER, HEADER_SIZE, FrameError, check_frame_size, decode_body,
+                         encode_frame, send_frame, set_low_latency)
+
+try:
+    import uvloop  # Optional: libuv-based event loop, faster for many small messages
+except ImportError:
+    uvloop = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -19,6 +33,11 @@ logger = logging.getLogger(__name__)
 
 # --- MCP Protocol Constants ---
 MCP_PROTOCOL_VERSION = "2024-11-05"
+# Protocol revision that added structuredContent to tool results. Connections
+# that negotiate it receive tool results as structured content, next to the
+# JSON text block every client receives.
+STRUCTURED_PROTOCOL_VERSION = "2025-06-18"
+SUPPORTED_PROTOCOL_VERSIONS = (MCP_PROTOCOL_VERSION, STRUCTURED_PROTOCOL_VERSION)
 SERVER_NAME = "application-usage-mcp"
 SERVER_VERSION = "1.0.0"
 
@@ -52,11 +71,313 @@ class ErrorCode:
     INVALID_PARAMS = -32602   # Invalid method parameter(s)
     INTERNAL_ERROR = -32603   # Internal JSON-RPC error
 
+# Response to a frame that is not valid JSON. It has no request id to echo,
+# so the whole response is constant and is sent without any encoding.
+PARSE_ERROR_RESPONSE = b'{"jsonrpc":"2.0","id":null,"error":{"code":-32700,"message":"Invalid JSON"}}'
+
+# --- Connection Buffering ---
+RECV_BUFFER_SIZE = 65536   # Initial size of each connection's receive buffer
+MAX_QUEUED_FRAMES = 64     # Stop reading from a client once this many messages are waiting
+MAX_CORKED_BYTES = 65536   # Send held-back responses once this many bytes are waiting
+INLINE_MAX_SIZE = 256      # Only messages this small are checked for an immediate answer
+
+# --- Tool Result Caching ---
+# Read-only, parameter-free tools whose results change slowly. Clients tend to
+# call them repeatedly while exploring the data, so their results are reused
+# for RESULT_CACHE_TTL seconds instead of querying SQLite every time. They take
+# no arguments, so there is at most one cached result per tool.
+CACHED_TOOLS = frozenset({
+    "get_unique_users",
+    "get_unique_applications",
+    "get_unique_platforms",
+    "analyze_platform_distribution",
+    "analyze_system_overview",
+})
+# Tools that modify usage logs; calling one empties this process's cache.
+WRITE_TOOLS = frozenset({
+    "create_usage_log",
+    "create_usage_logs_bulk",
+    "update_usage_log",
+    "delete_usage_log",
+})
+RESULT_CACHE_TTL = 30.0    # Seconds a cached tool result stays valid
+STATS_CACHE_TTL = 5.0      # Seconds the usage://stats resource stays valid; it is polled as live data
+# With several worker processes sharing the port, a write handled by one worker
+# does not clear the caches of the others, so both TTLs are capped at this
+SHARED_CACHE_TTL = 1.0
+
+def encode_json_array(items) -> bytearray:
+    """
+    Encode an iterable as a JSON array, one element at a time.
+    
+    Only the encoded output is accumulated, so a generator of rows can be
+    encoded without ever building the full list of rows.
+    
+    Args:
+        items (iterable): JSON-serializable elements
+        
+    Returns:
+        bytearray: Encoded JSON array
+        
+    Example:
+        logs = encode_json_array(db.iter_usage_logs({"user": "john"}))
+    """
+    out = bytearray(b'[')
+    for item in items:
+        out += orjson.dumps(item)
+        out += b','
+    if len(out) > 1:
+        out[-1] = ord(']')
+    else:
+        out += b']'
+    return out
+
+def compile_argument_extractor(schema: Dict[str, Any]):
+    """
+    Generate a function that pulls a tool's arguments out in schema order.
+    
+    The function is generated as source so each call is a single tuple
+    expression instead of a loop over the property names. Missing optional
+    arguments take the property's "default", or None.
+    
+    Args:
+        schema (Dict[str, Any]): Tool inputSchema with an ordered "properties" object
+        
+    Returns:
+        callable: Function mapping an arguments dict to a tuple of values
+        
+    Example:
+        extract = compile_argument_extractor(tools["analyze_top_users"]["inputSchema"])
+        extract({"app_name": "chrome.exe"})  # ("chrome.exe", 10)
+    """
+    values = "".join(
+        f"arguments.get({name!r}, {prop.get('default')!r}), "
+        for name, prop in schema.get("properties", {}).items()
+    )
+    namespace = {}
+    exec(f"def extract(arguments):\n    return ({values})", namespace)
+    return namespace["extract"]
+
+class MCPConnection(asyncio.BufferedProtocol):
+    """
+    Transport protocol for a single MCP client connection.
+
+    The transport receives straight into a reusable bytearray owned by the
+    connection (socket recv_into), so incoming data is never copied into an
+    intermediate StreamReader buffer. Complete length-prefixed frames are
+    sliced out of that buffer through a memoryview and queued for the server,
+    which processes them one at a time in arrival order.
+
+    The connection also provides writelines() and drain() with the same
+    semantics as asyncio.StreamWriter, so it can be passed to send_frame().
+    Responses are held back until the end of the current event loop
+    iteration, so responses produced together (e.g. pipelined pings) are
+    sent with one write, while no response waits for a slower request.
+
+    Requests with a constant answer (ping, tools/list, resources/list) are
+    answered as soon as they are received instead of being queued, so they
+    do not wait behind slower requests such as database queries.
+
+    Attributes:
+        server (MCPServer): Server that processes the received messages
+        transport (asyncio.Transport): Underlying socket transport
+        addr (tuple): Peer address of the client
+        protocol_version (str): Protocol version negotiated by this client's
+                                initialize request
+    """
+
+    def __init__(self, server):
+        """
+        Initialize the connection state.
+
+        Args:
+            server (MCPServer): Server that processes the received messages
+        """
+        self.server = server
+        self.transport = None
+        self.addr = None
+        # Set by initialize; decides how tool results are encoded for this client
+        self.protocol_version = MCP_PROTOCOL_VERSION
+        self._buffer = bytearray(RECV_BUFFER_SIZE)
+        self._filled = 0
+        self._frames = asyncio.Queue()
+        self._reading_paused = False
+        self._writing_paused = False
+        self._drain_waiter = None
+        self._corked = []
+        self._corked_size = 0
+        self._flush_handle = None
+        self._task = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.addr = transport.get_extra_info('peername')
+        sock = transport.get_extra_info('socket')
+        set_low_latency(sock)
+        logger.info(f"New MCP connection from {self.addr}")
+        self._task = asyncio.get_running_loop().create_task(self._process_frames())
+
+    def get_buffer(self, sizehint):
+        # Grow the buffer when a single frame does not fit in it. This can only
+        # happen here, before the transport takes a view of the buffer.
+        if self._filled == len(self._buffer):
+            self._buffer.extend(bytes(len(self._buffer)))
+        return memoryview(self._buffer)[self._filled:]
+
+    def buffer_updated(self, nbytes):
+        self._filled += nbytes
+
+        # Queue every complete frame currently in the buffer
+        pos = 0
+        try:
+            with memoryview(self._buffer) as view:
+                while self._filled - pos >= HEADER_SIZE:
+                    flags, size = HEADER.unpack_from(view, pos)
+                    check_frame_size(size)
+                    end = pos + HEADER_SIZE + size
+                    if end > self._filled:
+                        break
+                    data = decode_body(flags, view[pos + HEADER_SIZE:end])
+                    if (size > INLINE_MAX_SIZE or self._writing_paused
+                            or not self._respond_inline(data)):
+                        self._frames.put_nowait(data)
+                    pos = end
+        except FrameError as e:
+            # The stream can no longer be trusted to be in sync
+            logger.warning(f"Closing connection {self.addr}: {e}")
+            self.transport.close()
+            return
+
+        # Move a partially received frame to the start of the buffer. The
+        # transport still holds a view here, so the size must not change.
+        if pos:
+            remaining = self._filled - pos
+            self._buffer[:remaining] = self._buffer[pos:self._filled]
+            self._filled = remaining
+
+        # Once a large frame has been consumed, release the grown buffer
+        # instead of keeping it for the life of the connection. Replacing it
+        # is safe while the transport still holds a view of the old one.
+        if not self._filled and len(self._buffer) > RECV_BUFFER_SIZE:
+            self._buffer = bytearray(RECV_BUFFER_SIZE)
+
+        if not self._reading_paused and self._frames.qsize() >= MAX_QUEUED_FRAMES:
+            self._reading_paused = True
+            self.transport.pause_reading()
+
+    def connection_lost(self, exc):
+        logger.info(f"Connection from {self.addr} closed.")
+        # Let the processing task finish the messages already received
+        self._frames.put_nowait(None)
+        self._wake_drain_waiter(exc or ConnectionResetError("Connection lost"))
+
+    def pause_writing(self):
+        self._writing_paused = True
+
+    def resume_writing(self):
+        self._writing_paused = False
+        self._wake_drain_waiter(None)
+
+    def writelines(self, data):
+        """
+        Queue several buffers for sending without joining them first.
+
+        The buffers are held back for at most one event loop iteration, or
+        until MAX_CORKED_BYTES have accumulated.
+
+        Args:
+            data (iterable): Byte buffers to write in order
+        """
+        self._cork(data)
+        if self._corked_size >= MAX_CORKED_BYTES:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+
+    def _respond_inline(self, data):
+        """
+        Send the answer to a request the server can answer without awaiting.
+
+        Args:
+            data (bytes): Encoded JSON-RPC message
+
+        Returns:
+            bool: True if the request was answered, False if it must be queued
+        """
+        response = self.server.respond_inline(self, data)
+        if response is None:
+            return False
+        self.writelines(encode_frame(response))
+        return True
+
+    def _cork(self, data):
+        """Hold back byte buffers until the next _flush()."""
+        for buf in data:
+            self._corked.append(buf)
+            self._corked_size += len(buf)
+
+    def _flush(self):
+        """Hand all held-back buffers to the transport in one write."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._corked:
+            if not self.transport.is_closing():
+                self.transport.writelines(self._corked)
+            self._corked = []
+            self._corked_size = 0
+
+    async def drain(self):
+        """
+        Wait until the transport's write buffer is below its high-water mark.
+
+        Raises:
+            ConnectionResetError: If the connection has been closed
+        """
+        if self.transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if not self._writing_paused:
+            return
+        self._drain_waiter = asyncio.get_running_loop().create_future()
+        await self._drain_waiter
+
+    def _wake_drain_waiter(self, exc):
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is None or waiter.done():
+            return
+        if exc is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(exc)
+
+    async def _process_frames(self):
+        """
+        Hand queued frames to the server one at a time until the peer disconnects.
+        """
+        try:
+            while True:
+                data = await self._frames.get()
+                if data is None:
+                    break
+                if self._reading_paused and self._frames.qsize() < MAX_QUEUED_FRAMES // 2:
+                    self._reading_paused = False
+                    self.transport.resume_reading()
+                await self.server.handle_frame(self, data)
+        except ConnectionError:
+            logger.info(f"Connection {self.addr} lost before all responses were sent")
+        except Exception as e:
+            logger.error(f"Error with connection {self.addr}: {e}")
+        finally:
+            self._flush()
+            self.transport.close()
+            logger.info(f"Connection {self.addr} closed")
+
 class MCPServer:
     """
     Model Context Protocol (MCP) Server Implementation.
     
-    This class implements a full MCP server following the MCP 2024-11-05 specification.
+    This class implements a full MCP server following the MCP 2024-11-05 specification,
+    and adds structured tool results for connections that negotiate 2025-06-18.
     It provides a standardized interface for AI assistants to interact with application
     usage data through well-defined tools and resources.
     
@@ -71,6 +392,7 @@ class MCPServer:
     
     The server exposes the following tools:
     - create_usage_log: Create new usage log entries
+    - create_usage_logs_bulk: Create many usage log entries in one transaction
     - get_usage_logs: Retrieve usage logs with filtering
     - update_usage_log: Update existing log entries
     - delete_usage_log: Delete log entries
@@ -84,8 +406,10 @@ class MCPServer:
     Attributes:
         host (str): Server bind address
         port (int): Server bind port
-        db_manager (DatabaseManager): Database interface
+        db_pool (DatabaseConnectionPool): Pooled database connections
+        db_executor (ThreadPoolExecutor): Threads that run database calls
         initialized (bool): Whether server initialization is complete
+        ready (asyncio.Event): Set once the server accepts connections
         client_capabilities (dict): Capabilities reported by connected clients
         tools (dict): Available tools with their schemas
         resources (dict): Available resources with their metadata
@@ -95,20 +419,29 @@ class MCPServer:
         await server.start()
     """
     
-    def __init__(self, host=settings.MCP_HOST, port=settings.MCP_PORT):
+    def __init__(self, host=settings.MCP_HOST, port=settings.MCP_PORT, reuse_port=False):
         """
-        Initialize MCP server with database and tool definitions.
+        Initialize MCP server with tool definitions. The database is opened
+        later by startup().
         
         Args:
             host (str): Server bind address. Defaults to settings.MCP_HOST
             port (int): Server bind port. Defaults to settings.MCP_PORT
+            reuse_port (bool): Bind with SO_REUSEPORT so several worker processes
+                               can accept on the same port. Defaults to False
         """
         self.host = host
         self.port = port
-        self.db_manager = DatabaseManager()
-        self.db_manager.initialize_database()
+        self.reuse_port = reuse_port
+        # Opened by startup(), so constructing a server does no blocking I/O
+        self.db_pool = None
+        # SQLite calls block, so they run here instead of on the event loop
+        self.db_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.DB_WORKERS, thread_name_prefix="mcp-db")
         self.initialized = False
         self.client_capabilities = {}
+        # Created on first use, from inside the event loop, see ready
+        self._ready = None
         
         # Define available tools with JSON schemas for input validation
         # Each tool corresponds to a database operation and includes:
@@ -135,6 +468,21 @@ class MCPServer:
                                "application_version", "log_date", "legacy_app", "duration_seconds"]
                 }
             },
+            "create_usage_logs_bulk": {
+                "name": "create_usage_logs_bulk",
+                "description": "Create several usage log entries in a single transaction",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "entries": {
+                            "type": "array",
+                            "description": "Usage log entries with the same fields as create_usage_log",
+                            "items": {"type": "object"}
+                        }
+                    },
+                    "required": ["entries"]
+                }
+            },
             "get_usage_logs": {
                 "name": "get_usage_logs",
                 "description": "Retrieve usage logs with optional filters",
@@ -362,72 +710,243 @@ class MCPServer:
             }
         }
 
-    async def handle_client(self, reader, writer):
+        # Map each tool to the DatabaseManager method that implements it; it is
+        # called on a pooled connection with the tool's extracted arguments.
+        # Built once so dispatch is a single dict lookup, and only the tools
+        # listed here are callable.
+        self._tool_dispatch = {
+            "create_usage_log": DatabaseManager.create_usage_log,
+            "create_usage_logs_bulk": DatabaseManager.create_usage_logs,
+            # Log rows are encoded as they are read, returning encoded JSON
+            "get_usage_logs": lambda db, filters: encode_json_array(db.iter_usage_logs(filters)),
+            "update_usage_log": DatabaseManager.update_usage_log,
+            "delete_usage_log": DatabaseManager.delete_usage_log,
+            "get_unique_users": DatabaseManager.get_unique_users,
+            "get_unique_applications": DatabaseManager.get_unique_applications,
+            "get_unique_platforms": DatabaseManager.get_unique_platforms,
+            "analyze_top_users": DatabaseManager.get_top_users_by_app,
+            "analyze_new_users": DatabaseManager.get_new_users_in_period,
+            "analyze_inactive_users": DatabaseManager.get_inactive_users_since,
+            "analyze_weekly_additions": DatabaseManager.get_user_additions_by_week,
+            "analyze_application_stats": DatabaseManager.get_application_usage_stats,
+            "analyze_platform_distribution": DatabaseManager.get_platform_distribution,
+            "analyze_daily_trends": DatabaseManager.get_daily_usage_trends,
+            "analyze_user_activity": DatabaseManager.get_user_activity_summary,
+            "analyze_system_overview": DatabaseManager.get_system_overview,
+        }
+
+        # Turn a tool's arguments into the positional arguments of its method.
+        # The inputSchema properties are declared in parameter order, so the
+        # extractors are generated from them; create_usage_log takes the
+        # whole argument object instead.
+        self._tool_arguments = {
+            name: compile_argument_extractor(tool["inputSchema"]) for name, tool in self.tools.items()
+        }
+        self._tool_arguments["create_usage_log"] = lambda arguments: (arguments,)
+
+        # Argument validators compiled once from each tool's inputSchema
+        self._tool_validators = {
+            name: compile_validator(tool["inputSchema"]) for name, tool in self.tools.items()
+        }
+
+        # Results of CACHED_TOOLS: tool name -> (time stored, encoded result)
+        self._result_cache = {}
+        # Workers sharing the port cannot invalidate each other's caches, so
+        # there cached results must only be stale for a short time
+        ttl_limit = SHARED_CACHE_TTL if reuse_port else float("inf")
+        self.result_cache_ttl = min(RESULT_CACHE_TTL, ttl_limit)
+        self.stats_cache_ttl = min(STATS_CACHE_TTL, ttl_limit)
+        # Bumped on every write so a read that overlapped it is not cached
+        self._cache_generation = 0
+        # Encoded usage://stats read result: (generation, time stored, bytes)
+        self._stats_cache = None
+
+        # Method name -> (handler, takes_params, requires_init, takes_connection).
+        # Handlers are called with (message_id, params) if takes_params, else
+        # (message_id); takes_connection adds the connection the request
+        # arrived on, for handlers that use its negotiated protocol version
+        self._method_handlers = {
+            MessageType.INITIALIZE: (self.handle_initialize, True, False, True),
+            MessageType.TOOLS_LIST: (self.handle_tools_list, False, True, False),
+            MessageType.TOOLS_CALL: (self.handle_tools_call, True, True, True),
+            MessageType.RESOURCES_LIST: (self.handle_resources_list, False, True, False),
+            MessageType.RESOURCES_READ: (self.handle_resources_read, True, True, False),
+            MessageType.PING: (self.handle_ping, False, True, False),
+        }
+
+        # Results that never change for the lifetime of the server are encoded
+        # once; only the request id is filled in per response
+        self._initialize_results = {
+            version: orjson.dumps({
+                "protocolVersion": version,
+                "capabilities": {
+                    "tools": {},    # Tool capabilities (currently empty)
+                    "resources": {} # Resource capabilities (currently empty)
+                },
+                "serverInfo": {
+                    "name": SERVER_NAME,
+                    "version": SERVER_VERSION
+                }
+            })
+            for version in SUPPORTED_PROTOCOL_VERSIONS
+        }
+        self._tools_list_result = orjson.dumps({"tools": list(self.tools.values())})
+        self._resources_list_result = orjson.dumps({"resources": list(self.resources.values())})
+
+        # Encoded results of the methods answered without queueing, see respond_inline()
+        self._inline_results = {
+            MessageType.PING: b'{}',
+            MessageType.TOOLS_LIST: self._tools_list_result,
+            MessageType.RESOURCES_LIST: self._resources_list_result,
+        }
+        # Their method names as they appear in an encoded request, checked
+        # before parsing so other small requests are not parsed twice
+        self._inline_method_tokens = tuple(orjson.dumps(method) for method in self._inline_results)
+
+    async def handle_frame(self, connection, data: bytes):
         """
-        Handle incoming client connections.
+        Handle one message received from a client connection.
         
-        Manages the lifecycle of a client connection, including:
-        - Reading incoming messages
-        - Processing JSON-RPC requests
-        - Sending responses
+        Called by MCPConnection for every complete frame, in the order the
+        frames arrived on that connection. Handles:
+        - Parsing the JSON-RPC message
+        - Processing the request, or every request of a batch
+        - Sending the response
         - Error handling and logging
-        - Connection cleanup
-        
-        This method runs in a loop for each connected client and handles
-        multiple requests over a single connection.
         
         Args:
-            reader (asyncio.StreamReader): Stream for reading client data
-            writer (asyncio.StreamWriter): Stream for writing responses
+            connection (MCPConnection): Connection the message arrived on
+            data (bytes): Encoded JSON-RPC message
             
         Example:
-            # This method is called automatically by the TCP server
-            # when a new client connects
+            # This method is called automatically by MCPConnection
+            # whenever a full frame has been received
+        """
+        addr = connection.addr
+        try:
+            # Parse JSON-RPC message
+            message = orjson.loads(data)
+            # Per-message logs are lazy and skipped entirely below DEBUG level
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Received from %s: %s", addr, message)
+            
+            if isinstance(message, list):
+                response = await self.process_batch(message, connection)
+            else:
+                response = await self.process_message(message, connection)
+            if response:
+                await send_frame(connection, response)
+                if debug:
+                    logger.debug("Sent response: %s", response)
+                
+        except orjson.JSONDecodeError:
+            await send_frame(connection, PARSE_ERROR_RESPONSE)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            error_response = self.create_error_response(
+                None, ErrorCode.INTERNAL_ERROR, str(e)
+            )
+            await send_frame(connection, error_response)
+
+    def respond_inline(self, connection, data: bytes) -> Optional[bytes]:
         """
-        addr = writer.get_extra_info('peername')
-        logger.info(f"New MCP connection from {addr}")
+        Answer a request whose result is constant, without queueing it.
         
+        Called by MCPConnection for small frames as soon as they arrive.
+        ping, tools/list and resources/list are answered here once the
+        server is initialized; everything else, including notifications
+        and malformed JSON, is left for handle_frame(). Frames that do not
+        even contain one of these method names are passed on without being
+        parsed, so e.g. a small tools/call is only parsed by handle_frame().
+        
+        Args:
+            connection (MCPConnection): Connection the message arrived on
+            data (bytes): Encoded JSON-RPC message
+            
+        Returns:
+            Optional[bytes]: Encoded JSON-RPC response, or None if the
+                             message must be processed by handle_frame()
+        """
+        if not self.initialized:
+            return None
+        if not any(token in data for token in self._inline_method_tokens):
+            return None
         try:
-            while True:
-                data = await reader.read(4096)
-                if not data:
-                    logger.info(f"Connection from {addr} closed.")
-                    break
+            message = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(message, dict) or "id" not in message:
+            return None
+        # A non-string method (possibly unhashable) is reported by handle_frame()
+        method = message.get("method")
+        if not isinstance(method, str):
+            return None
+        result = self._inline_results.get(method)
+        if result is None:
+            return None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received from %s: %s", connection.addr, message)
+        return self.encode_result(message["id"], result)
 
-                try:
-                    # Parse JSON-RPC message
-                    message = json.loads(data.decode())
-                    logger.info(f"Received from {addr}: {message}")
-                    
-                    response = await self.process_message(message)
-                    if response:
-                        response_data = json.dumps(response).encode()
-                        writer.write(response_data)
-                        await writer.drain()
-                        logger.info(f"Sent response: {response}")
-                        
-                except json.JSONDecodeError:
-                    error_response = self.create_error_response(
-                        None, ErrorCode.PARSE_ERROR, "Invalid JSON"
-                    )
-                    writer.write(json.dumps(error_response).encode())
-                    await writer.drain()
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    error_response = self.create_error_response(
-                        None, ErrorCode.INTERNAL_ERROR, str(e)
-                    )
-                    writer.write(json.dumps(error_response).encode())
-                    await writer.drain()
+    async def process_batch(self, messages: list, connection=None) -> Optional[bytes]:
+        """
+        Process a JSON-RPC 2.0 batch of messages.
+        
+        The messages are processed concurrently, so database calls of
+        independent requests overlap on the database threads. Responses are
+        returned in request order as a single JSON array; notifications have
+        no entry in it.
+        
+        Args:
+            messages (list): The decoded batch
+            connection (MCPConnection): Connection the batch arrived on, if any
+            
+        Returns:
+            Optional[bytes]: Encoded array of responses, an encoded error
+                            response for an empty batch, or None if the batch
+                            only contained notifications
+            
+        Example:
+            response = await process_batch([
+                {"jsonrpc": "2.0", "method": "ping", "id": 1},
+                {"jsonrpc": "2.0", "method": "tools/list", "id": 2}
+            ])
+        """
+        if not messages:
+            return self.create_error_response(None, ErrorCode.INVALID_REQUEST, "Empty batch")
+        
+        responses = await asyncio.gather(*(self._process_batch_item(m, connection) for m in messages))
+        responses = [response for response in responses if response is not None]
+        if not responses:
+            return None
+        return b'[' + b','.join(responses) + b']'
 
-        except Exception as e:
-            logger.error(f"Error with connection {addr}: {e}")
-        finally:
-            writer.close()
-            await writer.wait_closed()
-            logger.info(f"Connection {addr} closed")
+    async def _process_batch_item(self, message: Any, connection=None) -> Optional[bytes]:
+        """
+        Process one message of a batch and return its encoded response.
+        
+        Errors are turned into error responses for that message only, so one
+        failing request does not affect the rest of the batch. Notifications
+        return None, even if they fail.
+        """
+        if not isinstance(message, dict):
+            response = self.create_error_response(None, ErrorCode.INVALID_REQUEST, "Invalid Request")
+        else:
+            try:
+                response = await self.process_message(message, connection)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                if "id" not in message:
+                    return None
+                response = self.create_error_response(
+                    message.get("id"), ErrorCode.INTERNAL_ERROR, str(e)
+                )
+        return response
 
-    async def process_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def process_message(self, message: Dict[str, Any], connection=None) -> Optional[bytes]:
         """
         Process incoming JSON-RPC messages and route to appropriate handlers.
         
@@ -438,6 +957,10 @@ class MCPServer:
         The method enforces proper initialization order - all methods except
         'initialize' require the server to be initialized first.
         
+        Messages without an id are JSON-RPC notifications: they are processed
+        but never answered, not even with an error. Only a message without a
+        method is answered, because it is not a valid notification either.
+        
         Supported MCP protocol methods:
         - initialize: Server initialization handshake
         - tools/list: List available tools
@@ -452,10 +975,12 @@ class MCPServer:
                 - method (str): RPC method name
                 - params (dict, optional): Method parameters
                 - id (str/int, optional): Request identifier
+            connection (MCPConnection): Connection the message arrived on, if
+                                        any; it holds the negotiated protocol version
                 
         Returns:
-            Optional[Dict[str, Any]]: JSON-RPC response with result or error,
-                                     None for notification messages
+            Optional[bytes]: Encoded JSON-RPC response with result or error,
+                             None for notification messages
                 
         Example:
             message = {
@@ -470,37 +995,53 @@ class MCPServer:
         method = message.get("method")
         params = message.get("params", {})
         
-        # Validate message structure - method is required
+        # Validate message structure - method is required and must be a
+        # string; anything else could not even be looked up in the handler table
         if not method:
             return self.create_error_response(message_id, ErrorCode.INVALID_REQUEST, "Missing method")
+        if not isinstance(method, str):
+            return self.create_error_response(message_id, ErrorCode.INVALID_REQUEST, "method must be a string")
         
-        # Handle initialization - this is the only method allowed before initialization
-        if method == MessageType.INITIALIZE:
-            return await self.handle_initialize(message_id, params)
+        response = await self._route_message(message_id, method, params, connection)
+        if "id" not in message:
+            return None
+        return response
+
+    async def _route_message(self, message_id, method: str, params: Any, connection=None) -> bytes:
+        """
+        Call the handler of a method and return its encoded response.
         
-        # Ensure server is initialized before processing other methods
-        if not self.initialized and method != MessageType.INITIALIZE:
+        Returns an error response if the server is not initialized, the
+        method is unknown, or params is not an object where one is expected.
+        """
+        # Route to appropriate method handlers
+        entry = self._method_handlers.get(method)
+        
+        # Ensure server is initialized before processing other methods;
+        # initialize is the only method allowed before initialization
+        if not self.initialized and (entry is None or entry[2]):
             return self.create_error_response(
                 message_id, ErrorCode.INVALID_REQUEST, "Server not initialized"
             )
         
-        # Route to appropriate method handlers
-        if method == MessageType.TOOLS_LIST:
-            return await self.handle_tools_list(message_id)
-        elif method == MessageType.TOOLS_CALL:
-            return await self.handle_tools_call(message_id, params)
-        elif method == MessageType.RESOURCES_LIST:
-            return await self.handle_resources_list(message_id)
-        elif method == MessageType.RESOURCES_READ:
-            return await self.handle_resources_read(message_id, params)
-        elif method == MessageType.PING:
-            return await self.handle_ping(message_id)
-        else:
+        if entry is None:
             return self.create_error_response(
                 message_id, ErrorCode.METHOD_NOT_FOUND, f"Unknown method: {method}"
             )
+        handler, takes_params, _, takes_connection = entry
+        if takes_params:
+            # Handlers read named parameters, so anything but an object is
+            # rejected here instead of failing inside the handler
+            if not isinstance(params, dict):
+                return self.create_error_response(
+                    message_id, ErrorCode.INVALID_PARAMS, "params must be an object"
+                )
+            if takes_connection:
+                return await handler(message_id, params, connection)
+            return await handler(message_id, params)
+        return await handler(message_id)
 
-    async def handle_initialize(self, message_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_initialize(self, message_id: str, params: Dict[str, Any], connection=None) -> bytes:
         """
         Handle MCP initialization handshake.
         
@@ -510,6 +1051,8 @@ class MCPServer:
         
         Validates the protocol version and stores client capabilities for
         future reference. Sets the server to initialized state on success.
+        The negotiated version is stored on the connection, so each client
+        gets tool results in the format of the version it asked for.
         
         Args:
             message_id (str): Request identifier for response matching
@@ -517,9 +1060,11 @@ class MCPServer:
                 - protocolVersion (str): Client's protocol version
                 - capabilities (dict): Client capability declarations
                 - clientInfo (dict, optional): Client information
+            connection (MCPConnection): Connection the request arrived on, if any
                 
         Returns:
-            Dict[str, Any]: JSON-RPC response with server capabilities and info
+            bytes: Encoded JSON-RPC response with server capabilities and info,
+                   or an error response
             
         Example:
             params = {
@@ -533,34 +1078,23 @@ class MCPServer:
         protocol_version = params.get("protocolVersion")
         
         # Validate protocol version compatibility
-        if protocol_version != MCP_PROTOCOL_VERSION:
+        result = self._initialize_results.get(protocol_version) if isinstance(protocol_version, str) else None
+        if result is None:
             return self.create_error_response(
                 message_id, ErrorCode.INVALID_PARAMS, 
                 f"Unsupported protocol version: {protocol_version}"
             )
         
         # Mark server as initialized
+        if connection is not None:
+            connection.protocol_version = protocol_version
         self.initialized = True
-        logger.info("MCP initialization completed successfully")
+        logger.info(f"MCP initialization completed successfully (protocol {protocol_version})")
         
         # Return server capabilities and information
-        return {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "result": {
-                "protocolVersion": MCP_PROTOCOL_VERSION,
-                "capabilities": {
-                    "tools": {},    # Tool capabilities (currently empty)
-                    "resources": {} # Resource capabilities (currently empty)
-                },
-                "serverInfo": {
-                    "name": SERVER_NAME,
-                    "version": SERVER_VERSION
-                }
-            }
-        }
+        return self.encode_result(message_id, result)
 
-    async def handle_tools_list(self, message_id: str) -> Dict[str, Any]:
+    async def handle_tools_list(self, message_id: str) -> bytes:
         """
         Return list of available tools.
         
@@ -572,7 +1106,7 @@ class MCPServer:
             message_id (str): Request identifier for response matching
             
         Returns:
-            Dict[str, Any]: JSON-RPC response containing:
+            bytes: Encoded JSON-RPC response containing:
                 - tools: List of tool definitions with metadata
                 
         Example:
@@ -592,16 +1126,9 @@ class MCPServer:
             #     }
             # }
         """
-        tools_list = list(self.tools.values())
-        return {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "result": {
-                "tools": tools_list
-            }
-        }
+        return self.encode_result(message_id, self._tools_list_result)
 
-    async def handle_tools_call(self, message_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_tools_call(self, message_id: str, params: Dict[str, Any], connection=None) -> bytes:
         """
         Execute a tool call with the provided arguments.
         
@@ -611,6 +1138,7 @@ class MCPServer:
         
         Available tools:
         - create_usage_log: Create new usage log entry
+        - create_usage_logs_bulk: Create several usage log entries at once
         - get_usage_logs: Retrieve usage logs with optional filters
         - update_usage_log: Update existing usage log
         - delete_usage_log: Delete usage log by ID
@@ -623,9 +1151,12 @@ class MCPServer:
             params (Dict[str, Any]): Tool execution parameters containing:
                 - name (str): Tool name to execute
                 - arguments (dict): Tool-specific arguments
+            connection (MCPConnection): Connection the request arrived on, if any
                 
         Returns:
-            Dict[str, Any]: JSON-RPC response with tool execution results
+            bytes: Encoded JSON-RPC response with tool execution results as
+                   JSON text content, plus structuredContent for connections
+                   that negotiated STRUCTURED_PROTOCOL_VERSION
             
         Raises:
             Exception: Database operation errors or invalid arguments
@@ -645,82 +1176,31 @@ class MCPServer:
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
         
-        # Validate tool existence
-        if tool_name not in self.tools:
+        # Validate tool existence and look up its handler in one step; a
+        # non-string name would not even be hashable, so it is checked first
+        handler = self._tool_dispatch.get(tool_name) if isinstance(tool_name, str) else None
+        if handler is None:
             return self.create_error_response(
                 message_id, ErrorCode.INVALID_PARAMS, f"Unknown tool: {tool_name}"
             )
+
+        # Reject arguments that do not match the tool's input schema
+        error = self._tool_validators[tool_name](arguments)
+        if error:
+            return self.create_error_response(message_id, ErrorCode.INVALID_PARAMS, error)
         
         try:
-            # Route to appropriate database manager method
-            if tool_name == "create_usage_log":
-                result = self.db_manager.create_usage_log(arguments)
-            elif tool_name == "get_usage_logs":
-                filters = arguments.get("filters", {})
-                result = self.db_manager.get_usage_logs(filters)
-            elif tool_name == "update_usage_log":
-                log_id = arguments["log_id"]
-                updates = arguments["updates"]
-                result = self.db_manager.update_usage_log(log_id, updates)
-            elif tool_name == "delete_usage_log":
-                log_id = arguments["log_id"]
-                result = self.db_manager.delete_usage_log(log_id)
-            elif tool_name == "get_unique_users":
-                result = self.db_manager.get_unique_users()
-            elif tool_name == "get_unique_applications":
-                result = self.db_manager.get_unique_applications()
-            elif tool_name == "get_unique_platforms":
-                result = self.db_manager.get_unique_platforms()
-            elif tool_name == "analyze_top_users":
-                app_name = arguments.get("app_name")
-                limit = arguments.get("limit", 10)
-                result = self.db_manager.get_top_users_by_app(app_name, limit)
-            elif tool_name == "analyze_new_users":
-                start_date = arguments.get("start_date")
-                end_date = arguments.get("end_date")
-                app_name = arguments.get("app_name")
-                result = self.db_manager.get_new_users_in_period(start_date, end_date, app_name)
-            elif tool_name == "analyze_inactive_users":
-                cutoff_date = arguments.get("cutoff_date")
-                app_name = arguments.get("app_name")
-                result = self.db_manager.get_inactive_users_since(cutoff_date, app_name)
-            elif tool_name == "analyze_weekly_additions":
-                start_date = arguments.get("start_date")
-                end_date = arguments.get("end_date")
-                result = self.db_manager.get_user_additions_by_week(start_date, end_date)
-            elif tool_name == "analyze_application_stats":
-                app_name = arguments.get("app_name")
-                result = self.db_manager.get_application_usage_stats(app_name)
-            elif tool_name == "analyze_platform_distribution":
-                result = self.db_manager.get_platform_distribution()
-            elif tool_name == "analyze_daily_trends":
-                start_date = arguments.get("start_date")
-                end_date = arguments.get("end_date")
-                app_name = arguments.get("app_name")
-                result = self.db_manager.get_daily_usage_trends(start_date, end_date, app_name)
-            elif tool_name == "analyze_user_activity":
-                user_name = arguments.get("user_name")
-                result = self.db_manager.get_user_activity_summary(user_name)
-            elif tool_name == "analyze_system_overview":
-                result = self.db_manager.get_system_overview()
-            else:
-                return self.create_error_response(
-                    message_id, ErrorCode.INTERNAL_ERROR, f"Tool implementation missing: {tool_name}"
-                )
+            # Route to the appropriate database manager method
+            result = await self.call_tool(tool_name, handler, arguments)
             
-            # Format result in MCP content structure
-            return {
-                "jsonrpc": "2.0",
-                "id": message_id,
-                "result": {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({"result": result, "tool": tool_name})
-                        }
-                    ]
-                }
-            }
+            # Tool results (lists of log rows, analytics dicts) are the
+            # largest payloads the server encodes, so the result is encoded
+            # once and the response is assembled around those bytes
+            if not isinstance(result, (bytes, bytearray)):
+                result = orjson.dumps(result)
+            structured = (connection is not None
+                          and connection.protocol_version == STRUCTURED_PROTOCOL_VERSION)
+            return self.encode_tool_result(message_id, tool_name, result, structured)
             
         except Exception as e:
             logger.error(f"Error executing tool {tool_name}: {e}")
@@ -728,7 +1208,7 @@ class MCPServer:
                 message_id, ErrorCode.INTERNAL_ERROR, f"Tool execution failed: {e}"
             )
 
-    async def handle_resources_list(self, message_id: str) -> Dict[str, Any]:
+    async def handle_resources_list(self, message_id: str) -> bytes:
         """
         Return list of available resources.
         
@@ -740,7 +1220,7 @@ class MCPServer:
             message_id (str): Request identifier for response matching
             
         Returns:
-            Dict[str, Any]: JSON-RPC response containing:
+            bytes: Encoded JSON-RPC response containing:
                 - resources: List of resource definitions with metadata
                 
         Example:
@@ -760,22 +1240,186 @@ class MCPServer:
             #     }
             # }
         """
-        resources_list = list(self.resources.values())
-        return {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "result": {
-                "resources": resources_list
-            }
-        }
+        return self.encode_result(message_id, self._resources_list_result)
+
+    def encode_result(self, message_id, result: bytes) -> bytes:
+        """
+        Build an encoded JSON-RPC response around an already encoded result.
+        
+        Args:
+            message_id (str/int): Request identifier for response matching
+            result (bytes): Encoded JSON value of the "result" member
+            
+        Returns:
+            bytes: Encoded JSON-RPC response
+            
+        Example:
+            response = self.encode_result("list-1", self._tools_list_result)
+        """
+        return b'{"jsonrpc":"2.0","id":' + orjson.dumps(message_id) + b',"result":' + result + b'}'
+
+    def encode_tool_result(self, message_id, tool_name: str, result: bytes,
+                           structured: bool = False) -> bytes:
+        """
+        Build an encoded tools/call response around an already encoded result.
+        
+        The result is formatted in MCP content structure as a text block,
+        escaped as one JSON string. With structured, it is also embedded as
+        structuredContent, without being decoded or re-encoded; the text
+        block is kept alongside, as the 2025-06-18 specification asks for
+        clients that do not read structured content.
+        
+        Args:
+            message_id (str/int): Request identifier for response matching
+            tool_name (str): Name of the tool that produced the result
+            result (bytes): Encoded JSON result of the tool
+            structured (bool): Add structuredContent. Defaults to False
+            
+        Returns:
+            bytes: Encoded JSON-RPC response
+            
+        Example:
+            response = self.encode_tool_result("call-1", "get_usage_logs", b'[]')
+        """
+        payload = b'{"result":' + result + b',"tool":' + orjson.dumps(tool_name) + b'}'
+        content = b'{"content":[{"type":"text","text":' + orjson.dumps(payload.decode()) + b'}]'
+        if structured:
+            return self.encode_result(message_id, content + b',"structuredContent":' + payload + b'}')
+        return self.encode_result(message_id, content + b'}')
+
+    async def call_tool(self, tool_name: str, handler, arguments: Dict[str, Any]) -> Any:
+        """
+        Run a tool handler, reusing a recent result for read-only tools.
+        
+        Results of CACHED_TOOLS are kept encoded for result_cache_ttl seconds,
+        keyed by tool name only since these tools take no arguments. Calling
+        any of WRITE_TOOLS empties the cache so later reads see the change;
+        writes handled by other worker processes are only seen once the
+        entry expires, which is why the TTL is short with several workers.
+        
+        Args:
+            tool_name (str): Name of the tool being called
+            handler (callable): Entry of _tool_dispatch for the tool
+            arguments (Dict[str, Any]): Validated tool arguments
+            
+        Returns:
+            Any: Result of the tool handler; encoded JSON bytes for CACHED_TOOLS
+            
+        Example:
+            users = await self.call_tool("get_unique_users",
+                                         self._tool_dispatch["get_unique_users"], {})
+        """
+        args = self._tool_arguments[tool_name](arguments)
+        if tool_name not in CACHED_TOOLS:
+            try:
+                return await self.run_db(handler, *args)
+            finally:
+                if tool_name in WRITE_TOOLS:
+                    self.invalidate_caches()
+
+        entry = self._result_cache.get(tool_name)
+        if entry is not None and time.monotonic() - entry[0] < self.result_cache_ttl:
+            return entry[1]
+
+        generation = self._cache_generation
+        # Stored encoded, so a cache hit skips encoding as well as the query
+        result = orjson.dumps(await self.run_db(handler, *args))
+        if generation == self._cache_generation:
+            self._result_cache[tool_name] = (time.monotonic(), result)
+        return result
+
+    def invalidate_caches(self):
+        """
+        Discard cached tool results and the cached usage://stats resource.
+        
+        Called after every tool that writes usage logs. Reads that were
+        already running when this is called do not store their results.
+        """
+        self._cache_generation += 1
+        self._result_cache.clear()
+        self._stats_cache = None
+
+    async def run_db(self, func, *args):
+        """
+        Run a blocking database call on the database thread pool.
+        
+        The call runs on a worker thread with a pooled DatabaseManager, and
+        the event loop keeps serving other connections while it runs.
+        
+        Args:
+            func (callable): Function taking a DatabaseManager followed by *args
+            *args: Remaining arguments for func
+            
+        Returns:
+            Any: Whatever func returns
+            
+        Example:
+            logs = await self.run_db(DatabaseManager.get_usage_logs, {"user": "john"})
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, self.db_pool.run, func, *args)
+
+    @property
+    def ready(self) -> asyncio.Event:
+        """
+        Event that start() sets once the server accepts connections.
+        
+        It is created on first use rather than in __init__, because servers
+        are usually constructed before the event loop that runs them exists,
+        and on Python < 3.10 an Event binds to the loop current at creation.
+        
+        Example:
+            task = asyncio.create_task(server.start())
+            await server.ready.wait()
+        """
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        return self._ready
 
-    async def handle_resources_read(self, message_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def startup(self):
+        """
+        Open the database connection pool and create the schema if needed.
+        
+        Opening connections and running the schema script block on disk I/O,
+        so this runs on the database thread pool instead of in __init__ or on
+        the event loop. start() calls it before accepting connections; code
+        that drives the server without start() must await it first. Calling
+        it again once the pool is open does nothing.
+        
+        Raises:
+            sqlite3.Error: If the database cannot be opened or initialized
+            
+        Example:
+            server = MCPServer()
+            await server.startup()
+        """
+        if self.db_pool is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self.db_pool = await loop.run_in_executor(self.db_executor, self._open_database)
+
+    @staticmethod
+    def _open_database() -> DatabaseConnectionPool:
+        """
+        Open the connection pool and initialize the database schema.
+        
+        Returns:
+            DatabaseConnectionPool: Pool with one connection per database thread
+        """
+        # One pooled connection per database thread, so calls run in parallel
+        db_pool = DatabaseConnectionPool(size=settings.DB_WORKERS)
+        with db_pool.connection() as db:
+            db.initialize_database()
+        return db_pool
+
+    async def handle_resources_read(self, message_id: str, params: Dict[str, Any]) -> bytes:
         """
         Read the content of a specific resource.
         
         Retrieves and returns the content of the requested resource identified
         by its URI. Currently supports usage statistics resource that provides
-        real-time database metrics.
+        real-time database metrics. The encoded statistics are reused until
+        usage logs are written or stats_cache_ttl expires.
         
         Supported resources:
         - usage://stats: Current usage statistics and database metrics
@@ -786,7 +1430,7 @@ class MCPServer:
                 - uri (str): Resource URI to read
                 
         Returns:
-            Dict[str, Any]: JSON-RPC response with resource content
+            bytes: Encoded JSON-RPC response with resource content
             
         Raises:
             Exception: Database access errors or resource generation failures
@@ -809,28 +1453,34 @@ class MCPServer:
         uri = params.get("uri")
         
         if uri == "usage://stats":
+            # Statistics only change when usage logs are written, so the
+            # encoded result is reused until a write or stats_cache_ttl
+            cached = self._stats_cache
+            if (cached is not None and cached[0] == self._cache_generation
+                    and time.monotonic() - cached[1] < self.stats_cache_ttl):
+                return self.encode_result(message_id, cached[2])
+
             # Generate real-time usage statistics
             try:
-                all_logs = self.db_manager.get_usage_logs()
+                generation = self._cache_generation
                 stats = {
-                    "total_logs": len(all_logs),
-                    "last_updated": datetime.now().isoformat(),
+                    "total_logs": await self.run_db(DatabaseManager.count_usage_logs),
+                    "last_updated": datetime.now(),  # orjson writes ISO 8601 itself
                     "summary": "Application usage statistics"
                 }
                 
-                return {
-                    "jsonrpc": "2.0",
-                    "id": message_id,
-                    "result": {
-                        "contents": [
-                            {
-                                "uri": uri,
-                                "mimeType": "application/json",
-                                "text": json.dumps(stats, indent=2)
-                            }
-                        ]
-                    }
-                }
+                result = orjson.dumps({
+                    "contents": [
+                        {
+                            "uri": uri,
+                            "mimeType": "application/json",
+                            "text": orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode()
+                        }
+                    ]
+                })
+                if generation == self._cache_generation:
+                    self._stats_cache = (generation, time.monotonic(), result)
+                return self.encode_result(message_id, result)
             except Exception as e:
                 return self.create_error_response(
                     message_id, ErrorCode.INTERNAL_ERROR, f"Failed to read resource: {e}"
@@ -840,7 +1490,7 @@ class MCPServer:
                 message_id, ErrorCode.INVALID_PARAMS, f"Unknown resource: {uri}"
             )
 
-    async def handle_ping(self, message_id: str) -> Dict[str, Any]:
+    async def handle_ping(self, message_id: str) -> bytes:
         """
         Handle ping request for server health check.
         
@@ -852,7 +1502,7 @@ class MCPServer:
             message_id (str): Request identifier for response matching
             
         Returns:
-            Dict[str, Any]: JSON-RPC response with empty result indicating success
+            bytes: Encoded JSON-RPC response with empty result indicating success
             
         Example:
             response = await handle_ping("ping-1")
@@ -862,19 +1512,17 @@ class MCPServer:
             #     "result": {}
             # }
         """
-        return {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "result": {}
-        }
+        return self.encode_result(message_id, b'{}')
 
-    def create_error_response(self, message_id: Optional[str], code: int, message: str) -> Dict[str, Any]:
+    def create_error_response(self, message_id: Optional[str], code: int, message: str) -> bytes:
         """
-        Create a JSON-RPC 2.0 compliant error response.
+        Create an encoded JSON-RPC 2.0 compliant error response.
         
         Formats error responses according to the JSON-RPC 2.0 specification,
         which is required by the MCP protocol. Error responses are used to
-        communicate failures back to the client.
+        communicate failures back to the client. The response bytes are
+        assembled around the encoded id and message, so no response dict is
+        built or serialized.
         
         Standard JSON-RPC error codes:
         - -32700: Parse error (invalid JSON)
@@ -890,7 +1538,7 @@ class MCPServer:
             message (str): Human-readable error description
             
         Returns:
-            Dict[str, Any]: JSON-RPC error response with:
+            bytes: Encoded JSON-RPC error response with:
                 - jsonrpc: Protocol version "2.0"
                 - id: Original request ID or null
                 - error: Error object with code and message
@@ -899,28 +1547,23 @@ class MCPServer:
             error_response = create_error_response(
                 "req-1", -32601, "Method not found"
             )
-            # Returns: {
-            #     "jsonrpc": "2.0",
-            #     "id": "req-1", 
-            #     "error": {"code": -32601, "message": "Method not found"}
-            # }
+            # Returns: b'{"jsonrpc":"2.0","id":"req-1",'
+            #          b'"error":{"code":-32601,"message":"Method not found"}}'
         """
-        return {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "error": {
-                "code": code,
-                "message": message
-            }
-        }
+        return (b'{"jsonrpc":"2.0","id":' + orjson.dumps(message_id)
+                + b',"error":{"code":%d,"message":' % code + orjson.dumps(message) + b'}}')
 
     async def start(self):
         """
         Start the MCP server and begin listening for client connections.
         
-        Creates an asyncio TCP server that listens for incoming MCP client
-        connections. Each client connection is handled concurrently by the
-        handle_client method. The server will continue running until stopped.
+        Opens the database via startup(), then creates an asyncio TCP server
+        that listens for incoming MCP client connections. Each client
+        connection is handled concurrently by its own MCPConnection protocol.
+        The ready event is set as soon as connections are accepted, so callers
+        can wait for it instead of polling the port. If the server was created
+        with port 0, self.port holds the port chosen by the OS by then. The
+        server will continue running until stopped.
         
         The server logs important information including:
         - Listening address and port
@@ -933,18 +1576,29 @@ class MCPServer:
             
         Example:
             server = MCPServer()
-            await server.start()  # Server starts listening
+            task = asyncio.create_task(server.start())
+            await server.ready.wait()  # Server is listening
+            client = MCPClient(port=server.port)
         """
-        server = await asyncio.start_server(
-            self.handle_client, self.host, self.port)
+        await self.startup()
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(
+            lambda: MCPConnection(self), self.host, self.port,
+            reuse_port=self.reuse_port)
 
         addr = server.sockets[0].getsockname()
+        # Report the actual port when the OS assigned one (port 0)
+        self.port = addr[1]
         logger.info(f'MCP Server listening on {addr[0]}:{addr[1]}')
-        logger.info(f'Protocol version: {MCP_PROTOCOL_VERSION}')
+        logger.info(f'Protocol versions: {", ".join(SUPPORTED_PROTOCOL_VERSIONS)}')
         logger.info(f'Available tools: {list(self.tools.keys())}')
 
         async with server:
-            await server.serve_forever()
+            self.ready.set()
+            try:
+                await server.serve_forever()
+            finally:
+                self.ready.clear()
 
     async def shutdown(self):
         """
@@ -965,10 +1619,33 @@ class MCPServer:
                 await server.shutdown()
         """
         logger.info("Shutting down MCP server...")
-        self.db_manager.disconnect()
+        self.db_executor.shutdown(wait=True)
+        if self.db_pool is not None:
+            self.db_pool.close()
+
 
+def run_event_loop(coro):
+    """
+    Run a coroutine to completion on a new event loop.
+    
+    Uses uvloop when it is installed (it is not available on Windows) and
+    the standard asyncio event loop otherwise.
+    
+    Args:
+        coro (coroutine): Coroutine to run, typically main()
+        
+    Returns:
+        Any: Whatever the coroutine returns
+        
+    Example:
+        run_event_loop(main())
+    """
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
 
-async def main():
+
+async def main(reuse_port=False):
     """
     Main entry point for the MCP server application.
     
@@ -982,11 +1659,14 @@ async def main():
     3. Handle shutdown signals gracefully
     4. Clean up resources on exit
     
+    Args:
+        reuse_port (bool): Bind with SO_REUSEPORT (used by worker processes)
+    
     Example:
         python mcp_server.py  # Starts the server
         # Press Ctrl+C to shutdown gracefully
     """
-    server = MCPServer()
+    server = MCPServer(reuse_port=reuse_port)
     try:
         await server.start()
     except KeyboardInterrupt:
@@ -995,5 +1675,65 @@ async def main():
         await server.shutdown()
 
 
+def run_worker():
+    """
+    Entry point of one server worker process.
+    
+    Each worker runs its own event loop and DatabaseManager and binds the
+    shared port with SO_REUSEPORT, so the kernel spreads incoming
+    connections across the workers. SIGTERM (sent by the parent when it is
+    stopped) shuts the worker down the same way as Ctrl+C.
+    """
+    # Replace the handlers inherited from the parent process
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        run_event_loop(main(reuse_port=True))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(workers=settings.MCP_WORKERS):
+    """
+    Run the MCP server in several processes for CPU parallelism.
+    
+    JSON handling and dispatch run on a single event loop thread, so one
+    process can use only one core. Falls back to a single in-process server
+    when one worker is requested, when not running on Linux (Windows lacks
+    SO_REUSEPORT, and macOS and the BSDs do not balance connections across
+    the sockets sharing a port), or when MCP_PORT is 0, since each worker
+    would then be given a different port.
+    
+    SIGTERM or SIGINT sent to this process is passed on to the workers,
+    which are waited for before returning, so stopping the parent never
+    leaves orphaned workers behind.
+    
+    Args:
+        workers (int): Number of server processes. Defaults to settings.MCP_WORKERS
+    """
+    if workers <= 1 or not sys.platform.startswith("linux") or settings.MCP_PORT == 0:
+        if workers > 1:
+            logger.info(f"Running a single MCP server process instead of {workers} workers "
+                        f"(needs Linux and a fixed MCP_PORT)")
+        run_event_loop(main())
+        return
+
+    logger.info(f"Starting {workers} MCP server workers")
+    processes = [multiprocessing.Process(target=run_worker) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    def stop_workers(signum, frame):
+        logger.info(f"Received signal {signum}, stopping MCP server workers")
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    for process in processes:
+        process.join()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_workers()
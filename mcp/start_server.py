@@ -6,7 +6,6 @@ This script starts the MCP server and keeps it running.
 Use Ctrl+C to gracefully shutdown the server.
 """
 
-import asyncio
 import sys
 import os
 import signal
@@ -15,7 +14,7 @@ import logging
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from mcp_server import MCPServer
+from mcp_server import MCPServer, run_event_loop
 
 # Configure logging
 logging.basicConfig(
@@ -56,7 +55,7 @@ if __name__ == "__main__":
     print()
     
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         print("\nServer stopped by user")
     except Exception as e:
@@ -1,36 +1,86 @@
 """
 MCP Protocol Schema Validation Utilities
 """
-import json
 import jsonschema
+import orjson
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 import logging
 
+try:
+    import fastjsonschema  # Optional: compiles schemas into specialized Python code
+except ImportError:
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Any], Optional[str]]:
+    """
+    Compile a JSON schema into a reusable validation function.
+    
+    With fastjsonschema installed the schema is turned into generated Python
+    code; otherwise a jsonschema validator is built once, so the schema itself
+    is not re-checked against the meta-schema on every call.
+    
+    Args:
+        schema: The JSON schema to validate against
+        
+    Returns:
+        Function taking an instance and returning None if it is valid,
+        or an error message if it is not
+    """
+    if fastjsonschema is not None:
+        validate = fastjsonschema.compile(schema)
+        
+        def check(instance):
+            try:
+                validate(instance)
+                return None
+            except fastjsonschema.JsonSchemaException as e:
+                return f"Validation error: {e.message}"
+        return check
+    
+    compiled = jsonschema.validators.validator_for(schema)(schema)
+    
+    def check(instance):
+        try:
+            compiled.validate(instance)
+            return None
+        except jsonschema.ValidationError as e:
+            return f"Validation error: {e.message}"
+    return check
+
 class SchemaValidator:
     def __init__(self):
-        self.schemas = {}
-        self._load_schemas()
-    
-    def _load_schemas(self):
-        """Load all JSON schemas from the schemas directory"""
         schema_dir = os.path.dirname(__file__)
         schema_files = {
             "initialize_request": "initialize_request.json",
             "tool_call_request": "tool_call_request.json",
             "resource_read_request": "resource_read_request.json"
         }
-        
-        for schema_name, file_name in schema_files.items():
-            schema_path = os.path.join(schema_dir, file_name)
+        self._schema_paths = {
+            schema_name: os.path.join(schema_dir, file_name)
+            for schema_name, file_name in schema_files.items()
+        }
+        # Filled on first use, so schemas that are never used are never read
+        self.schemas = {}
+        self._validators = {}
+    
+    def _get_validator(self, schema_name: str) -> Callable[[Any], Optional[str]]:
+        """Load and compile a schema the first time it is used"""
+        validate = self._validators.get(schema_name)
+        if validate is None:
             try:
-                with open(schema_path, 'r') as f:
-                    self.schemas[schema_name] = json.load(f)
-                logger.debug(f"Loaded schema: {schema_name}")
+                with open(self._schema_paths[schema_name], 'rb') as f:
+                    self.schemas[schema_name] = orjson.loads(f.read())
+                validate = compile_validator(self.schemas[schema_name])
             except Exception as e:
                 logger.error(f"Failed to load schema {schema_name}: {e}")
+                raise
+            self._validators[schema_name] = validate
+            logger.debug(f"Loaded schema: {schema_name}")
+        return validate
     
     def validate_message(self, message: Dict[str, Any], schema_name: str) -> Optional[str]:
         """
@@ -43,14 +93,11 @@ class SchemaValidator:
         Returns:
             None if valid, error message if invalid
         """
-        if schema_name not in self.schemas:
+        if schema_name not in self._schema_paths:
             return f"Unknown schema: {schema_name}"
         
         try:
-            jsonschema.validate(message, self.schemas[schema_name])
-            return None
-        except jsonschema.ValidationError as e:
-            return f"Validation error: {e.message}"
+            return self._get_validator(schema_name)(message)
         except Exception as e:
             return f"Schema validation failed: {e}"
     
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup: makes the project packages importable from the tests.
+"""
+
+import sys
+import os
+
+# Add project root to the Python path once for the whole test session
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
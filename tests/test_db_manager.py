@@ -0,0 +1,194 @@
+"""
+Tests for DatabaseManager transactions and the database connection pool.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from database.connection_pool import DatabaseConnectionPool
+from database.db_manager import DatabaseManager
+
+
+def usage_log(user="john_doe", duration=60, **fields):
+    """Build a complete usage log entry for create_usage_log()."""
+    log = {
+        "monitor_app_version": "1.0.0",
+        "platform": "Windows",
+        "user": user,
+        "application_name": "chrome.exe",
+        "application_version": "120.0",
+        "log_date": "2024-01-15",
+        "legacy_app": False,
+        "duration_seconds": duration,
+    }
+    log.update(fields)
+    return log
+
+
+def write_usage_logs(db_path, calls):
+    """Merge calls one-second usage logs into one record (runs in a child process)."""
+    with DatabaseManager(db_path) as db:
+        for _ in range(calls):
+            if db.create_usage_log(usage_log(duration=1)) is None:
+                raise SystemExit(1)
+
+
+class TestTransaction(unittest.TestCase):
+    """transaction() nesting, commit and rollback on an in-memory database."""
+
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+        self.db.initialize_database()
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_nested_methods_join_the_outer_transaction(self):
+        with self.db.transaction():
+            self.db.create_usage_log(usage_log("alice"))
+            # The inner with-block of create_usage_log must not have committed
+            self.assertTrue(self.db.conn.in_transaction)
+            self.db.create_usage_log(usage_log("bob"))
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertEqual(self.db._transaction_depth, 0)
+        self.assertEqual(self.db.count_usage_logs(), 2)
+
+    def test_outer_block_rolls_back_on_exception(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.create_usage_log(usage_log("alice"))
+                with self.db.transaction():
+                    self.db.create_usage_log(usage_log("bob"))
+                raise ValueError("abort")
+        self.assertEqual(self.db._transaction_depth, 0)
+        self.assertEqual(self.db.count_usage_logs(), 0)
+
+    def test_create_usage_logs_merges_and_skips(self):
+        ids = self.db.create_usage_logs([
+            usage_log("alice", 60),
+            {"user": "incomplete"},
+            usage_log("alice", 30),
+            usage_log("bob", 10),
+        ])
+        self.assertIsNone(ids[1])
+        self.assertEqual(ids[0], ids[2])
+        self.assertNotEqual(ids[0], ids[3])
+        logs = {log["user"]: log for log in self.db.get_usage_logs()}
+        self.assertEqual(logs["alice"]["duration_seconds"], 90)
+        self.assertEqual(logs["bob"]["duration_seconds"], 10)
+        self.assertIs(logs["bob"]["legacy_app"], False)
+
+    def test_create_usage_logs_rolls_back_whole_batch(self):
+        # NOT NULL violation on the second entry
+        ids = self.db.create_usage_logs([usage_log("alice"), usage_log("bob", platform=None)])
+        self.assertIsNone(ids)
+        self.assertEqual(self.db.count_usage_logs(), 0)
+
+    def test_suspended_iterator_does_not_hold_a_transaction(self):
+        self.db.create_usage_logs([usage_log("alice"), usage_log("bob")])
+        logs = self.db.iter_usage_logs()
+        next(logs)
+        # A write made while the iterator is paused must commit on its own
+        self.db.create_usage_log(usage_log("carol"))
+        self.assertEqual(self.db._transaction_depth, 0)
+        self.assertFalse(self.db.conn.in_transaction)
+        logs.close()
+
+
+class TestConnectionPoolRecovery(unittest.TestCase):
+    """Pooled connections are cleaned up, and only reopened when broken."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = DatabaseConnectionPool(size=1, db_path=os.path.join(self.tmpdir.name, "test.db"))
+        with self.pool.connection() as db:
+            db.initialize_database()
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def test_query_error_keeps_connection(self):
+        with self.pool.connection() as db:
+            conn = db.conn
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.connection() as db:
+                list(db.iter_usage_logs({"no_such_column": 1}))
+        with self.pool.connection() as db:
+            self.assertIs(db.conn, conn)
+
+    def test_query_error_rolls_back_open_transaction(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.connection() as db:
+                # Implicitly begins a transaction that is never committed
+                db.conn.execute("DELETE FROM usage_data")
+                db.conn.execute("SELECT no_such_column FROM usage_data")
+        with self.pool.connection() as db:
+            self.assertFalse(db.conn.in_transaction)
+
+    def test_broken_connection_is_reopened(self):
+        with self.assertRaises(sqlite3.ProgrammingError):
+            with self.pool.connection() as db:
+                conn = db.conn
+                conn.close()
+                list(db.iter_usage_logs())
+        with self.pool.connection() as db:
+            self.assertIsNot(db.conn, conn)
+            self.assertEqual(db.count_usage_logs(), 0)
+
+
+class TestConcurrentWriters(unittest.TestCase):
+    """Merging usage logs from several pooled connections at once."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = DatabaseConnectionPool(size=8, db_path=os.path.join(self.tmpdir.name, "test.db"))
+        with self.pool.connection() as db:
+            db.initialize_database()
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def test_no_duration_is_lost(self):
+        threads, calls = 8, 200
+        failures = []
+
+        def write():
+            for _ in range(calls):
+                if self.pool.run(DatabaseManager.create_usage_log, usage_log(duration=1)) is None:
+                    failures.append(1)
+
+        workers = [threading.Thread(target=write) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        logs = self.pool.run(DatabaseManager.get_usage_logs)
+        self.assertEqual(failures, [])
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0]["duration_seconds"], threads * calls)
+
+    def test_no_duration_is_lost_across_processes(self):
+        # Server workers started by run_workers() each open their own connections
+        processes, calls = 4, 200
+        children = [multiprocessing.Process(target=write_usage_logs, args=(self.pool.db_path, calls))
+                    for _ in range(processes)]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join()
+
+        logs = self.pool.run(DatabaseManager.get_usage_logs)
+        self.assertEqual([child.exitcode for child in children], [0] * processes)
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0]["duration_seconds"], processes * calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Tests for the length-prefixed frame format in mcp/framing.py.
+"""
+
+import unittest
+
+import zstandard
+
+from mcp.framing import (COMPRESS_MIN_SIZE, FLAG_ZSTD, HEADER, MAX_FRAME_SIZE, FrameError,
+                         check_frame_size, decode_body, encode_frame)
+
+
+class TestFraming(unittest.TestCase):
+    """Encoding and decoding of frame bodies."""
+
+    def test_small_payload_round_trip(self):
+        header, body = encode_frame(b'{"id":1}')
+        self.assertEqual(HEADER.unpack(header), (0, len(body)))
+        self.assertEqual(decode_body(0, body), b'{"id":1}')
+
+    def test_large_payload_is_compressed(self):
+        payload = b'{"user":"u"},' * COMPRESS_MIN_SIZE
+        header, body = encode_frame(payload)
+        flags, size = HEADER.unpack(header)
+        self.assertTrue(flags & FLAG_ZSTD)
+        self.assertLess(size, len(payload))
+        self.assertEqual(decode_body(flags, memoryview(body)), payload)
+
+    def test_oversized_frame_is_rejected(self):
+        check_frame_size(MAX_FRAME_SIZE)
+        with self.assertRaises(FrameError):
+            check_frame_size(MAX_FRAME_SIZE + 1)
+
+    def test_malformed_compressed_body_is_rejected(self):
+        with self.assertRaises(FrameError):
+            decode_body(FLAG_ZSTD, b"not a zstd frame")
+
+    def test_compressed_body_without_content_size_is_rejected(self):
+        compressor = zstandard.ZstdCompressor().compressobj()
+        body = compressor.compress(b"{}") + compressor.flush()
+        with self.assertRaises(FrameError):
+            decode_body(FLAG_ZSTD, body)
+
+    def test_compressed_body_larger_than_limit_is_rejected(self):
+        body = zstandard.ZstdCompressor().compress(bytes(MAX_FRAME_SIZE + 1))
+        with self.assertRaises(FrameError):
+            decode_body(FLAG_ZSTD, body)
+
+
+if __name__ == "__main__":
+    unittest.main()
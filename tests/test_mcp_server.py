@@ -0,0 +1,277 @@
+"""
+Tests for JSON-RPC message handling in the MCP server.
+"""
+
+import asyncio
+import base64
+import os
+import tempfile
+import unittest
+
+import orjson
+
+from database.connection_pool import DatabaseConnectionPool
+from mcp.framing import FLAG_ZSTD, HEADER, MAX_FRAME_SIZE, encode_frame, recv_frame, send_frame
+from mcp.mcp_server import (MCP_PROTOCOL_VERSION, RECV_BUFFER_SIZE, STRUCTURED_PROTOCOL_VERSION,
+                            MCPConnection, MCPServer)
+
+
+async def request(reader, writer, message):
+    """Send one JSON-RPC message and return the next decoded response."""
+    await send_frame(writer, orjson.dumps(message))
+    return orjson.loads(await asyncio.wait_for(recv_frame(reader), 5))
+
+
+class FakeTransport:
+    """Just enough of asyncio.Transport for MCPConnection's receive path."""
+
+    def __init__(self):
+        self.closed = False
+
+    def pause_reading(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def feed(connection, data, chunk_size):
+    """Deliver data to a connection the way a transport does, chunk_size bytes per read."""
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        while chunk:
+            with connection.get_buffer(-1) as view:
+                nbytes = min(len(view), len(chunk))
+                view[:nbytes] = chunk[:nbytes]
+            connection.buffer_updated(nbytes)
+            chunk = chunk[nbytes:]
+
+
+class ServerTestCase(unittest.TestCase):
+    """
+    Runs one MCPServer, backed by a temporary database, for all tests of a class.
+
+    The server and its event loop are created once in setUpClass instead of
+    per test, so tests only pay for their own requests. Tests run their
+    coroutines with run_async().
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.loop = asyncio.new_event_loop()
+        cls.server = MCPServer(port=0)
+        cls.server.db_pool = DatabaseConnectionPool(
+            size=2, db_path=os.path.join(cls.tmpdir.name, "test.db"))
+        with cls.server.db_pool.connection() as db:
+            db.initialize_database()
+        cls.server_task = cls.loop.create_task(cls.server.start())
+        cls.loop.run_until_complete(asyncio.wait_for(cls.server.ready.wait(), 5))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server_task.cancel()
+        cls.loop.run_until_complete(asyncio.gather(cls.server_task, return_exceptions=True))
+        cls.loop.run_until_complete(cls.server.shutdown())
+        cls.loop.close()
+        cls.tmpdir.cleanup()
+
+    def run_async(self, coro):
+        """Run a coroutine on the shared event loop and return its result."""
+        return self.loop.run_until_complete(coro)
+
+    async def open_session(self, protocol_version=MCP_PROTOCOL_VERSION):
+        """Connect to the server and complete the initialize handshake."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        response = await request(reader, writer, {
+            "jsonrpc": "2.0", "id": 0, "method": "initialize",
+            "params": {
+                "protocolVersion": protocol_version,
+                "capabilities": {},
+                "clientInfo": {"name": "test-client", "version": "1.0.0"}
+            }
+        })
+        self.assertEqual(response["result"]["protocolVersion"], protocol_version)
+        self.addCleanup(writer.close)
+        return reader, writer
+
+
+class TestBatchNotifications(unittest.IsolatedAsyncioTestCase):
+    """Notifications inside a JSON-RPC batch must not be answered."""
+
+    def setUp(self):
+        # ping needs no database, so the server is never started
+        self.server = MCPServer(port=0)
+        self.server.initialized = True
+
+    def tearDown(self):
+        self.server.db_executor.shutdown()
+
+    async def test_notifications_are_dropped_from_batch_reply(self):
+        response = await self.server.process_batch([
+            {"jsonrpc": "2.0", "method": "ping"},
+            {"jsonrpc": "2.0", "method": "ping", "id": 3},
+        ])
+        self.assertEqual(orjson.loads(response), [{"jsonrpc": "2.0", "id": 3, "result": {}}])
+
+    async def test_batch_of_only_notifications_gets_no_reply(self):
+        response = await self.server.process_batch([
+            {"jsonrpc": "2.0", "method": "ping"},
+            {"jsonrpc": "2.0", "method": "unknown/method"},
+        ])
+        self.assertIsNone(response)
+
+
+class TestMessageValidation(unittest.IsolatedAsyncioTestCase):
+    """Malformed requests are rejected with the request's own id."""
+
+    def setUp(self):
+        self.server = MCPServer(port=0)
+        self.server.initialized = True
+
+    def tearDown(self):
+        self.server.db_executor.shutdown()
+
+    async def test_non_string_method_is_invalid_request(self):
+        for method in ({"x": 1}, ["ping"], 7):
+            response = orjson.loads(await self.server.process_message(
+                {"jsonrpc": "2.0", "id": 5, "method": method}))
+            self.assertEqual(response["id"], 5)
+            self.assertEqual(response["error"]["code"], -32600)
+
+
+class TestServerConnection(ServerTestCase):
+    """Requests sent over a real TCP connection."""
+
+    def test_ping_after_initialize(self):
+        async def scenario():
+            reader, writer = await self.open_session()
+            return await request(reader, writer, {"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        self.assertEqual(self.run_async(scenario()), {"jsonrpc": "2.0", "id": 1, "result": {}})
+
+    def test_non_string_method_keeps_connection_open(self):
+        async def scenario():
+            reader, writer = await self.open_session()
+            # Small enough to be checked for an inline answer; contains "ping"
+            bad = await request(reader, writer, {"jsonrpc": "2.0", "id": 2, "method": {"ping": 1}})
+            ping = await request(reader, writer, {"jsonrpc": "2.0", "id": 3, "method": "ping"})
+            return bad, ping
+        bad, ping = self.run_async(scenario())
+        self.assertEqual(bad["id"], 2)
+        self.assertIn("error", bad)
+        self.assertEqual(ping, {"jsonrpc": "2.0", "id": 3, "result": {}})
+
+    def test_tool_result_format_follows_each_connection(self):
+        call = {"jsonrpc": "2.0", "id": 4, "method": "tools/call",
+                "params": {"name": "get_unique_platforms", "arguments": {}}}
+
+        async def scenario():
+            # The structured client initializes last, so its choice must not
+            # leak into the legacy connection
+            legacy = await self.open_session(MCP_PROTOCOL_VERSION)
+            structured = await self.open_session(STRUCTURED_PROTOCOL_VERSION)
+            return await request(*legacy, call), await request(*structured, call)
+        legacy, structured = self.run_async(scenario())
+
+        self.assertNotIn("structuredContent", legacy["result"])
+        text = orjson.loads(legacy["result"]["content"][0]["text"])
+        self.assertEqual(text["tool"], "get_unique_platforms")
+
+        self.assertEqual(structured["result"]["structuredContent"], text)
+        self.assertEqual(orjson.loads(structured["result"]["content"][0]["text"]), text)
+
+
+class TestResultCache(ServerTestCase):
+    """Cached tool results and usage://stats are dropped when a tool writes."""
+
+    @staticmethod
+    def usage_log(user):
+        return {"monitor_app_version": "1.0.0", "platform": "Windows", "user": user,
+                "application_name": "chrome.exe", "application_version": "120.0",
+                "log_date": "2024-01-15", "legacy_app": False, "duration_seconds": 60}
+
+    def test_write_tool_refreshes_cached_reads(self):
+        users_call = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                      "params": {"name": "get_unique_users", "arguments": {}}}
+        stats_read = {"jsonrpc": "2.0", "id": 2, "method": "resources/read",
+                      "params": {"uri": "usage://stats"}}
+
+        async def reads(session):
+            users = await request(*session, users_call)
+            stats = await request(*session, stats_read)
+            return (orjson.loads(users["result"]["content"][0]["text"])["result"],
+                    orjson.loads(stats["result"]["contents"][0]["text"])["total_logs"])
+
+        async def scenario():
+            session = await self.open_session()
+            before = await reads(session)
+            # Written behind the server's back, so only the cached results are seen
+            with self.server.db_pool.connection() as db:
+                db.create_usage_log(self.usage_log("alice"))
+            cached = await reads(session)
+            generation = self.server._cache_generation
+            created = await request(*session, {
+                "jsonrpc": "2.0", "id": 3, "method": "tools/call",
+                "params": {"name": "create_usage_log", "arguments": self.usage_log("bob")}})
+            self.assertNotIn("error", created)
+            self.assertGreater(self.server._cache_generation, generation)
+            return before, cached, await reads(session)
+        before, cached, after = self.run_async(scenario())
+
+        self.assertEqual(before, ([], 0))
+        self.assertEqual(cached, before)
+        self.assertEqual(after, (["alice", "bob"], 2))
+
+
+class TestConnectionBuffer(unittest.TestCase):
+    """Reassembly of frames from the reads of MCPConnection."""
+
+    def setUp(self):
+        # Not initialized, so every frame is queued rather than answered inline
+        self.server = MCPServer(port=0)
+        self.connection = MCPConnection(self.server)
+        self.connection.transport = FakeTransport()
+
+    def tearDown(self):
+        self.server.db_executor.shutdown()
+
+    def queued(self):
+        frames = []
+        while not self.connection._frames.empty():
+            frames.append(self.connection._frames.get_nowait())
+        return frames
+
+    def test_frames_split_across_reads(self):
+        payloads = [b'{"jsonrpc":"2.0","id":1,"method":"ping"}', b'{"id":2}']
+        feed(self.connection, b"".join(b"".join(encode_frame(p)) for p in payloads), 3)
+        self.assertEqual(self.queued(), payloads)
+
+    def test_large_frame_grows_then_releases_buffer(self):
+        # Random data stays larger than the initial buffer after compression
+        payload = orjson.dumps(base64.b64encode(os.urandom(3 * RECV_BUFFER_SIZE)).decode())
+        header, body = encode_frame(payload)
+        self.assertGreater(len(body), RECV_BUFFER_SIZE)
+        data = header + body
+
+        # Everything but the last byte: the whole frame must fit in the buffer
+        feed(self.connection, data[:-1], 7777)
+        self.assertGreaterEqual(len(self.connection._buffer), len(data) - 1)
+        feed(self.connection, data[-1:], 1)
+
+        self.assertEqual(self.queued(), [payload])
+        self.assertEqual(len(self.connection._buffer), RECV_BUFFER_SIZE)
+
+    def test_oversized_header_closes_connection(self):
+        feed(self.connection, HEADER.pack(0, MAX_FRAME_SIZE + 1), 64)
+        self.assertTrue(self.connection.transport.closed)
+        self.assertEqual(self.queued(), [])
+
+    def test_malformed_compressed_frame_closes_connection(self):
+        body = b"not a zstd frame"
+        feed(self.connection, HEADER.pack(FLAG_ZSTD, len(body)) + body, 64)
+        self.assertTrue(self.connection.transport.closed)
+        self.assertEqual(self.queued(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()